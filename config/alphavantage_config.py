@@ -6,9 +6,21 @@ Configuração segura para API key e parâmetros da Alpha Vantage.
 """
 
 import os
+import re
+import functools
 from typing import Optional
 from pathlib import Path
 
+from core.logger import setup_logger
+
+
+# Diretórios resolvidos uma vez no import
+_CONFIG_DIR = Path(__file__).parent
+_PROJECT_DIR = _CONFIG_DIR.parent
+
+# Linha ALPHAVANTAGE_API_KEY=... dentro do .env (compilado uma vez no import)
+_ENV_KEY_RE = re.compile(r'^ALPHAVANTAGE_API_KEY=([^\n\r]*)', re.M)
+
 
 class AlphaVantageConfig:
     """Configuração centralizada para Alpha Vantage API"""
@@ -20,6 +32,9 @@ class AlphaVantageConfig:
     RATE_LIMIT_CALLS_PER_MINUTE = 5  # Free tier: 5 calls/min
     RATE_LIMIT_CALLS_PER_DAY = 500   # Free tier: 500 calls/day
 
+    # Saldo da cota diária persistido entre execuções
+    RATE_STATE_FILE = _CONFIG_DIR / '.rate_state.json'
+
     # Timeouts
     DEFAULT_TIMEOUT = 30  # Alpha Vantage pode ser lenta
 
@@ -60,27 +75,36 @@ class AlphaVantageConfig:
             return api_key.strip()
 
         # 2. Arquivo .env na raiz do projeto
-        env_file = Path(__file__).parent.parent / '.env'
-        if env_file.exists():
-            try:
-                with open(env_file, 'r') as f:
-                    for line in f:
-                        if line.startswith('ALPHAVANTAGE_API_KEY='):
-                            return line.split('=', 1)[1].strip().strip('"\'')
-            except Exception:
-                pass
+        env_file = _PROJECT_DIR / '.env'
+        try:
+            match = _ENV_KEY_RE.search(env_file.read_text(encoding='utf-8', errors='ignore'))
+            if match:
+                return match.group(1).strip().strip('"\'')
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self._raise_unreadable(env_file, e)
 
         # 3. Arquivo config/.api_key
-        api_key_file = Path(__file__).parent / '.api_key'
-        if api_key_file.exists():
-            try:
-                with open(api_key_file, 'r') as f:
-                    return f.read().strip()
-            except Exception:
-                pass
+        api_key_file = _CONFIG_DIR / '.api_key'
+        try:
+            return api_key_file.read_text(encoding='utf-8').strip()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self._raise_unreadable(api_key_file, e)
 
         return None
 
+    @staticmethod
+    def _raise_unreadable(path: Path, error: OSError):
+        """Loga e interrompe a busca: o arquivo existe mas não pode ser lido"""
+        setup_logger("scraper.config").error(
+            "Arquivo de API key existe mas não pôde ser lido",
+            extra={"path": str(path), "error_type": type(error).__name__, "error_message": str(error)}
+        )
+        raise ValueError(f"Não foi possível ler {path}: {error}") from error
+
     def _validate_config(self):
         """Valida configuração"""
         if not self.api_key:
@@ -120,33 +144,46 @@ class AlphaVantageConfig:
         Args:
             api_key: Sua API key da Alpha Vantage
         """
-        api_key_file = Path(__file__).parent / '.api_key'
+        api_key_file = _CONFIG_DIR / '.api_key'
+        logger = setup_logger("scraper.config")
 
         try:
-            with open(api_key_file, 'w') as f:
-                f.write(api_key.strip())
-
-            print(f"✅ API key salva em {api_key_file}")
-            print("⚠️  IMPORTANTE: Adicione 'config/.api_key' ao .gitignore!")
+            api_key_file.write_text(api_key.strip(), encoding='utf-8')
+        except OSError as e:
+            logger.error(
+                "Erro ao salvar API key",
+                extra={"path": str(api_key_file), "error_type": type(e).__name__, "error_message": str(e)}
+            )
+            raise ValueError(f"Erro ao salvar API key: {e}") from e
 
-        except Exception as e:
-            raise ValueError(f"Erro ao salvar API key: {e}")
+        logger.info("API key salva", extra={"path": str(api_key_file)})
+        logger.warning("Adicione 'config/.api_key' ao .gitignore!")
 
 
-# Instância global
+# Instância global (carregada uma única vez por processo)
+@functools.lru_cache(maxsize=1)
 def get_alphavantage_config() -> AlphaVantageConfig:
-    """Retorna configuração global da Alpha Vantage"""
+    """Retorna configuração global da Alpha Vantage (cacheada após a primeira leitura)"""
     return AlphaVantageConfig()
 
 
 # Para facilitar importação
-try:
-    config = get_alphavantage_config()
-    API_KEY = config.api_key
-    BASE_URL = config.BASE_URL
-    RATE_LIMIT_RPM = config.RATE_LIMIT_CALLS_PER_MINUTE
-except Exception as e:
-    # Durante import, não falhar se API key não estiver configurada
-    API_KEY = None
-    BASE_URL = "https://www.alphavantage.co/query"
-    RATE_LIMIT_RPM = 5
\ No newline at end of file
+BASE_URL = AlphaVantageConfig.BASE_URL
+RATE_LIMIT_RPM = AlphaVantageConfig.RATE_LIMIT_CALLS_PER_MINUTE
+
+
+def __getattr__(name: str):
+    """
+    Resolve `config` e `API_KEY` sob demanda (PEP 562).
+    Evita I/O no import e não falha se a API key não estiver configurada.
+    """
+    if name == 'config':
+        return get_alphavantage_config()
+
+    if name == 'API_KEY':
+        try:
+            return get_alphavantage_config().api_key
+        except ValueError:
+            return None
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
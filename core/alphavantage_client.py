@@ -8,26 +8,77 @@ Reutiliza toda infraestrutura existente: rate limiting, retry, logging.
 
 import requests
 import time
-from typing import Dict, Any, Optional
+import logging
+import functools
+import itertools
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Union
+from urllib.parse import urlparse
 from core.http_client import YahooFinanceClient  # Vamos herdar e adaptar
-from core.rate_limiter import RateLimiter
+from core.rate_limiter import RateLimiter, TokenBucket, CompositeTokenBucket
 from core.retry import RetryConfig
-from core.logger import setup_logger
+from core.logger import setup_logger, ContextLogger
+from core import json_utils
+from core.http_pool import get_session
+from core.file_cache import FileCache, INTRADAY_TTL
 from config.alphavantage_config import get_alphavantage_config, AlphaVantageConfig
 
 
+# Headers apropriados para Alpha Vantage (constantes, montados uma vez)
+_AV_HEADERS = MappingProxyType({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate',  # Removido 'br' (Brotli)
+    'Connection': 'keep-alive',
+    'Cache-Control': 'no-cache'
+})
+
+@functools.lru_cache(maxsize=None)
+def _get_default_rate_limiter() -> CompositeTokenBucket:
+    """
+    Rate limiter Alpha Vantage do processo (5 calls/min + 500 calls/dia),
+    criado no primeiro uso e compartilhado por todos os clientes: a quota é
+    por API key, e um bucket por instância não somaria o consumo (cada um
+    regravaria o estado diário em disco).
+    """
+    config = get_alphavantage_config()
+    return CompositeTokenBucket([
+        TokenBucket(rate=config.RATE_LIMIT_CALLS_PER_MINUTE / 60, capacity=1),
+        TokenBucket(
+            rate=config.RATE_LIMIT_CALLS_PER_DAY / 86400,
+            capacity=config.RATE_LIMIT_CALLS_PER_DAY,
+            state_file=config.RATE_STATE_FILE
+        )
+    ])
+
+
+# IDs de request monotônicos (semente em ms para continuar únicos entre execuções)
+_request_ids = itertools.count(int(time.time() * 1000))
+
+
 class AlphaVantageClient:
     """
     Cliente HTTP especializado para Alpha Vantage API.
     Reutiliza toda infraestrutura: rate limiting, retry, logging estruturado.
     """
 
+    # Função configurada -> (função efetivamente chamada, aceita outputsize)
+    # DAILY_ADJUSTED é premium: o diário usa TIME_SERIES_DAILY (versão gratuita)
+    _INTERVAL_DISPATCH = {
+        'TIME_SERIES_DAILY_ADJUSTED': ('TIME_SERIES_DAILY', True),
+        'TIME_SERIES_WEEKLY_ADJUSTED': ('TIME_SERIES_WEEKLY_ADJUSTED', False),
+        'TIME_SERIES_MONTHLY_ADJUSTED': ('TIME_SERIES_MONTHLY_ADJUSTED', False),
+    }
+
     def __init__(
         self,
         api_key: str = None,
-        rate_limiter: RateLimiter = None,
+        rate_limiter: Union[RateLimiter, CompositeTokenBucket] = None,
         retry_config: RetryConfig = None,
-        timeout: int = 30
+        timeout: int = 30,
+        cache: FileCache = None,
+        session: requests.Session = None
     ):
         """
         Inicializa cliente Alpha Vantage.
@@ -37,14 +88,17 @@ class AlphaVantageClient:
             rate_limiter: Rate limiter personalizado (usa padrão se None)
             retry_config: Configuração de retry
             timeout: Timeout em segundos
+            cache: Cache em disco das séries históricas (usa padrão de 24h se None)
+            session: Sessão HTTP injetada (usa a compartilhada do host se None)
         """
         # Carregar configuração
         self.config = get_alphavantage_config()
         self.api_key = api_key or self.config.api_key
+        self._base_params = {'apikey': self.api_key}
 
-        # Rate limiter específico para Alpha Vantage (5 calls/min)
+        # Rate limiter específico para Alpha Vantage, compartilhado entre instâncias
         if rate_limiter is None:
-            rate_limiter = RateLimiter(requests_per_minute=self.config.RATE_LIMIT_CALLS_PER_MINUTE)
+            rate_limiter = _get_default_rate_limiter()
 
         # Configurar retry específico para Alpha Vantage
         if retry_config is None:
@@ -56,11 +110,13 @@ class AlphaVantageClient:
 
         self.rate_limiter = rate_limiter
         self.timeout = timeout
+        self.cache = cache or FileCache(namespace='alphavantage')
         self.logger = setup_logger("scraper.alphavantage_client")
 
-        # Configurar sessão HTTP reutilizável
-        self.session = requests.Session()
-        self._setup_session_headers()
+        # Sessão HTTP compartilhada por host (pool de conexões reutilizável).
+        # O cliente nunca a fecha: a do pool é de todos os clientes do processo
+        # e a injetada é de quem a passou
+        self.session = session or get_session(urlparse(self.config.BASE_URL).netloc)
 
         # Setup retry handler
         from core.retry import RetryHandler
@@ -76,52 +132,45 @@ class AlphaVantageClient:
             }
         )
 
-    def _setup_session_headers(self):
-        """Configura headers apropriados para Alpha Vantage"""
-
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate',  # Removido 'br' (Brotli)
-            'Connection': 'keep-alive',
-            'Cache-Control': 'no-cache'
-        }
-
-        self.session.headers.update(headers)
-
-        self.logger.debug(
-            "Headers configurados para Alpha Vantage",
-            extra={"headers_count": len(headers)}
-        )
-
-    def _make_request(self, function: str, symbol: str = None, **kwargs) -> requests.Response:
+    def _make_request(self, function: str, symbol: str = None, **kwargs) -> Union[Dict[str, Any], bytes]:
         """
         Faz requisição para Alpha Vantage com rate limiting e retry.
 
         Args:
             function: Função da API (ex: 'TIME_SERIES_DAILY')
             symbol: Símbolo da ação (se aplicável)
-            **kwargs: Parâmetros adicionais da API
+            **kwargs: Parâmetros adicionais da API (datatype='csv' para séries em CSV)
 
         Returns:
-            Response object
+            Dados JSON já decodificados, ou o corpo CSV bruto se datatype='csv'
         """
-        # Preparar parâmetros base
-        params = {
-            'function': function,
-            'apikey': self.api_key
-        }
+        # Preparar parâmetros (base pré-montada no __init__)
+        params = {**self._base_params, 'function': function, **kwargs}
 
         # Adicionar símbolo se fornecido
         if symbol:
             params['symbol'] = symbol
 
-        # Adicionar parâmetros extras
-        params.update(kwargs)
+        csv = kwargs.get('datatype') == 'csv'
+
+        # Séries históricas não mudam durante o dia: servir do cache poupa a quota
+        cache_key = None
+        if function.startswith('TIME_SERIES'):
+            key_parts = ['alphavantage', function, symbol, kwargs.get('outputsize')]
+            if csv:
+                key_parts.append('csv')
+            cache_key = FileCache.make_key(*key_parts)
+            # 'compact' atende janelas curtas (últimos pregões): validade curta
+            ttl = INTRADAY_TTL if kwargs.get('outputsize') == 'compact' else None
+            cached = self.cache.get_bytes(cache_key, '.csv', ttl) if csv else self.cache.get_json(cache_key, ttl)
+            if cached is not None:
+                return cached
 
         # Request ID para tracking
-        request_id = f"av_req_{int(time.time() * 1000)}"
+        request_id = f"av_req_{next(_request_ids)}"
+
+        # Contexto fixo do request, mesclado em todos os logs abaixo
+        log = ContextLogger(self.logger, {"request_id": request_id, "function": function, "symbol": symbol})
 
         def _execute_request():
             """Função interna executada com retry"""
@@ -129,108 +178,140 @@ class AlphaVantageClient:
             # Rate limiting sempre aplicado
             self.rate_limiter.acquire()
 
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
 
-            self.logger.debug(
-                f"Executando requisição Alpha Vantage",
-                extra={
-                    "request_id": request_id,
-                    "function": function,
-                    "symbol": symbol,
-                    "params_count": len(params),
-                    "timeout": self.timeout
-                }
-            )
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(
+                    f"Executando requisição Alpha Vantage",
+                    extra={
+                        "params_count": len(params),
+                        "timeout": self.timeout
+                    }
+                )
 
             try:
+                # stream=True: o corpo é lido uma única vez (descomprimido on the fly)
+                # e parseado direto dos bytes, sem materializar response.text
                 response = self.session.get(
                     url=self.config.BASE_URL,
                     params=params,
-                    timeout=self.timeout
+                    headers=_AV_HEADERS,  # por request: a sessão pode ser compartilhada
+                    timeout=self.timeout,
+                    stream=True
                 )
 
-                # Verificar status HTTP
-                response.raise_for_status()
-
-                self.logger.debug(
-                    f"Resposta Alpha Vantage recebida",
-                    extra={
-                        "status_code": response.status_code,
-                        "content_type": response.headers.get('Content-Type'),
-                        "content_length": len(response.content)
-                    }
-                )
-
-                # Verificar se response é JSON válido
                 try:
-                    data = response.json()
-                except ValueError:
-                    # Log da resposta para debug
-                    self.logger.error(
-                        f"Resposta não é JSON válido",
+                    # Verificar status HTTP
+                    response.raise_for_status()
+                    # iter_content (e não raw.read) mantém os erros no meio do corpo
+                    # como ChunkedEncodingError/ConnectionError, que o retry reconhece
+                    body = b''.join(response.iter_content(chunk_size=65536))
+                    wire_length = response.raw.tell()
+                finally:
+                    response.close()
+
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug(
+                        f"Resposta Alpha Vantage recebida",
                         extra={
                             "status_code": response.status_code,
-                            "headers": dict(response.headers),
-                            "content": response.text[:500],  # Primeiros 500 chars
-                            "url": response.url
+                            "content_type": response.headers.get('Content-Type'),
+                            "content_length": len(body),
+                            "wire_length": wire_length
                         }
                     )
-                    raise ValueError("Resposta não é JSON válido")
-
-                response_time = time.time() - start_time
-
-                # Verificar se Alpha Vantage retornou erro
-                if 'Error Message' in data:
-                    raise ValueError(f"Alpha Vantage Error: {data['Error Message']}")
-
-                if 'Information' in data:
-                    # Rate limiting da própria Alpha Vantage
-                    if 'call frequency' in data['Information'].lower():
-                        raise requests.exceptions.HTTPError("Alpha Vantage rate limit exceeded")
-                    else:
-                        # Outros avisos informativos
-                        self.logger.warning(
-                            "Alpha Vantage Information",
-                            extra={
-                                "request_id": request_id,
-                                "information": data['Information']
-                            }
-                        )
+
+                elapsed_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+
+                # Pré-checagem em bytes: erros/avisos da Alpha Vantage trazem a
+                # chave no topo do payload, então séries válidas pulam essas checagens
+                head = body[:256]
+
+                # CSV: erros/avisos continuam chegando em JSON; o corpo CSV segue sem decodificar
+                if csv and not head.lstrip().startswith(b'{'):
+                    data = body
+                else:
+                    if b'"Error Message"' in head:
+                        data = self._decode_body(body, response)
+                        raise ValueError(f"Alpha Vantage Error: {data.get('Error Message')}")
+
+                    data = self._decode_body(body, response)
+
+                    if b'"Information"' in head and 'Information' in data:
+                        # Rate limiting da própria Alpha Vantage
+                        if 'call frequency' in data['Information'].lower():
+                            raise requests.exceptions.HTTPError("Alpha Vantage rate limit exceeded")
+                        else:
+                            # Outros avisos informativos
+                            log.warning(
+                                "Alpha Vantage Information",
+                                extra={
+                                    "information": data['Information']
+                                }
+                            )
+
+                    if csv:
+                        raise ValueError(f"Alpha Vantage não retornou CSV. Chaves: {list(data)}")
 
                 # Log de sucesso
-                self.logger.info(
+                log.info(
                     f"Requisição Alpha Vantage bem-sucedida",
                     extra={
-                        "request_id": request_id,
-                        "function": function,
-                        "symbol": symbol,
-                        "response_time_ms": round(response_time * 1000, 2),
-                        "content_length": len(response.content),
-                        "data_keys": list(data.keys()) if isinstance(data, dict) else "non-dict"
+                        "response_time_ms": elapsed_ms,
+                        "content_length": len(body),
+                        "data_key_count": len(data) if isinstance(data, dict) else 0
                     }
                 )
 
-                return response
+                return data
 
             except Exception as e:
-                response_time = time.time() - start_time
+                elapsed_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
-                self.logger.error(
+                log.error(
                     f"Requisição Alpha Vantage falhou",
                     extra={
-                        "request_id": request_id,
-                        "function": function,
-                        "symbol": symbol,
                         "error_type": type(e).__name__,
                         "error_message": str(e),
-                        "response_time_ms": round(response_time * 1000, 2)
+                        "response_time_ms": elapsed_ms
                     }
                 )
 
                 raise
 
         # Executar com retry automático
-        return self.retry_handler.execute(_execute_request)
+        data = self.retry_handler.execute(_execute_request)
+        if cache_key is not None:
+            # Só séries de fato vão para o cache: avisos (Information/Note sem
+            # série) seriam servidos por até 24h no lugar dos dados
+            if csv:
+                self.cache.set_bytes(cache_key, data, '.csv')
+            elif any('Time Series' in key for key in data):
+                self.cache.set_json(cache_key, data)
+        return data
+
+    def _decode_body(self, body: bytes, response: requests.Response) -> Dict[str, Any]:
+        """
+        Decodifica o corpo JSON da resposta.
+
+        Raises:
+            ValueError: Se o corpo não for JSON válido
+        """
+        try:
+            return json_utils.loads(body)
+        except ValueError:
+            # Log da resposta para debug
+            self.logger.error(
+                f"Resposta não é JSON válido",
+                extra={
+                    "status_code": response.status_code,
+                    "content_type": response.headers.get('Content-Type'),
+                    "content_length": len(body),
+                    "content": body[:500].decode('utf-8', errors='replace'),  # Primeiros 500 bytes
+                    "url": response.url
+                }
+            )
+            raise ValueError("Resposta não é JSON válido")
 
     def get_daily_data(self, symbol: str, outputsize: str = "compact") -> Dict[str, Any]:
         """
@@ -243,12 +324,11 @@ class AlphaVantageClient:
         Returns:
             Dados JSON da Alpha Vantage
         """
-        response = self._make_request(
+        return self._make_request(
             function='TIME_SERIES_DAILY',  # Versão gratuita
             symbol=symbol,
             outputsize=outputsize
         )
-        return response.json()
 
     def get_weekly_data(self, symbol: str) -> Dict[str, Any]:
         """
@@ -260,11 +340,10 @@ class AlphaVantageClient:
         Returns:
             Dados JSON da Alpha Vantage
         """
-        response = self._make_request(
+        return self._make_request(
             function='TIME_SERIES_WEEKLY_ADJUSTED',
             symbol=symbol
         )
-        return response.json()
 
     def get_monthly_data(self, symbol: str) -> Dict[str, Any]:
         """
@@ -276,11 +355,10 @@ class AlphaVantageClient:
         Returns:
             Dados JSON da Alpha Vantage
         """
-        response = self._make_request(
+        return self._make_request(
             function='TIME_SERIES_MONTHLY_ADJUSTED',
             symbol=symbol
         )
-        return response.json()
 
     def get_quote(self, symbol: str) -> Dict[str, Any]:
         """
@@ -292,13 +370,18 @@ class AlphaVantageClient:
         Returns:
             Dados JSON da Alpha Vantage
         """
-        response = self._make_request(
+        return self._make_request(
             function='GLOBAL_QUOTE',
             symbol=symbol
         )
-        return response.json()
 
-    def get_data_for_interval(self, symbol: str, interval: str, outputsize: str = "compact") -> Dict[str, Any]:
+    def get_data_for_interval(
+        self,
+        symbol: str,
+        interval: str,
+        outputsize: str = "compact",
+        datatype: str = "json"
+    ) -> Union[Dict[str, Any], bytes]:
         """
         Busca dados baseado no intervalo (compatível com chart.py).
 
@@ -306,26 +389,31 @@ class AlphaVantageClient:
             symbol: Símbolo da ação
             interval: Intervalo ('1d', '1wk', '1mo')
             outputsize: Tamanho da resposta
+            datatype: 'json' ou 'csv' (CSV é ~3x menor e vai direto para pd.read_csv)
 
         Returns:
-            Dados JSON da Alpha Vantage
+            Dados JSON da Alpha Vantage, ou o corpo CSV bruto se datatype='csv'
         """
         function = self.config.get_function_for_interval(interval)
 
-        if function == 'TIME_SERIES_DAILY_ADJUSTED':
-            return self.get_daily_data(symbol, outputsize)
-        elif function == 'TIME_SERIES_WEEKLY_ADJUSTED':
-            return self.get_weekly_data(symbol)
-        elif function == 'TIME_SERIES_MONTHLY_ADJUSTED':
-            return self.get_monthly_data(symbol)
-        else:
-            raise ValueError(f"Função não implementada: {function}")
+        try:
+            api_function, accepts_outputsize = self._INTERVAL_DISPATCH[function]
+        except KeyError:
+            raise ValueError(f"Função não implementada: {function}") from None
+
+        params = {'datatype': datatype} if datatype != 'json' else {}
+        if accepts_outputsize:
+            params['outputsize'] = outputsize
+        return self._make_request(function=api_function, symbol=symbol, **params)
 
     def close(self):
-        """Fecha sessão HTTP"""
-        if self.session:
-            self.session.close()
-            self.logger.info("Sessão Alpha Vantage fechada")
+        """
+        No-op: o cliente não é dono da sessão HTTP.
+
+        Sessões do pool (core.http_pool) são fechadas por http_pool.close_all();
+        sessões injetadas ficam a cargo de quem as criou. Mantido para o uso
+        como context manager.
+        """
 
     def __enter__(self):
         """Context manager support"""
@@ -336,5 +424,15 @@ class AlphaVantageClient:
         self.close()
 
 
-# Instância global padrão
-default_alphavantage_client = AlphaVantageClient()
\ No newline at end of file
+# Instância global padrão (criada sob demanda no primeiro uso)
+@functools.lru_cache(maxsize=None)
+def get_default_alphavantage_client() -> AlphaVantageClient:
+    """Retorna o cliente Alpha Vantage global, criando-o na primeira chamada"""
+    return AlphaVantageClient()
+
+
+def __getattr__(name: str):
+    """Mantém `default_alphavantage_client` disponível sem instanciar no import (PEP 562)"""
+    if name == 'default_alphavantage_client':
+        return get_default_alphavantage_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,213 @@
+"""
+Async Yahoo Finance HTTP Client
+===============================
+
+Versão asyncio/aiohttp do YahooFinanceClient para buscar muitos símbolos
+em paralelo: as requisições sobrepõem o RTT de rede em vez de esperar
+uma a uma, sempre respeitando o rate limiter.
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, List, Optional
+
+import aiohttp
+
+from core.logger import setup_logger
+from core import json_utils
+from core.http_client import STEALTH_HEADERS, YAHOO_HOST
+from core.rate_limiter import AsyncRateLimiter
+from core.retry import RetryConfig, RetryHandler
+
+
+# Status HTTP temporários que valem nova tentativa
+_RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class AsyncYahooFinanceClient:
+    """
+    Cliente HTTP assíncrono para Yahoo Finance.
+    Mantém uma única aiohttp.ClientSession com pool de conexões keep-alive.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: AsyncRateLimiter = None,
+        retry_config: RetryConfig = None,
+        timeout: int = 5,
+        max_concurrency: int = 16
+    ):
+        """
+        Inicializa o cliente assíncrono.
+
+        Args:
+            rate_limiter: Rate limiter assíncrono (usa 3 req/min se None, igual ao cliente síncrono)
+            retry_config: Configuração de retry (usa padrão se None)
+            timeout: Timeout em segundos para requisições
+            max_concurrency: Máximo de requisições simultâneas em voo
+        """
+        self.rate_limiter = rate_limiter or AsyncRateLimiter(requests_per_minute=3)
+        self.retry_handler = RetryHandler(retry_config or RetryConfig())
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.logger = setup_logger("scraper.async_http_client")
+
+        # Criados sob demanda dentro do event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Retorna a sessão compartilhada, criando-a na primeira chamada"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=max(1, self.max_concurrency // 2),
+                keepalive_timeout=30
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=STEALTH_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    @staticmethod
+    def _is_retryable_error(error: Exception) -> bool:
+        """Erros de rede/timeout e status HTTP temporários"""
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in _RETRYABLE_STATUS
+        return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+    async def get(self, url: str, params: Dict[str, Any] = None) -> Any:
+        """
+        Faz GET com rate limiting e retry automático.
+
+        Args:
+            url: URL para requisição
+            params: Query parameters
+
+        Returns:
+            JSON da resposta já decodificado
+        """
+        session = await self._get_session()
+        max_attempts = self.retry_handler.config.max_attempts
+
+        for attempt in range(1, max_attempts + 1):
+            async with self._semaphore:
+                await self.rate_limiter.acquire()
+                start_ns = time.perf_counter_ns()
+
+                try:
+                    async with session.get(url, params=params) as response:
+                        response.raise_for_status()
+                        body = await response.read()
+
+                    self.logger.info(
+                        "GET request bem-sucedida",
+                        extra={
+                            "url": url,
+                            "status_code": response.status,
+                            "response_time_ms": (time.perf_counter_ns() - start_ns) // 1_000_000,
+                            "content_length": len(body),
+                            "attempt": attempt
+                        }
+                    )
+                    return json_utils.loads(body)
+
+                except Exception as error:
+                    retryable = self._is_retryable_error(error)
+                    self.logger.error(
+                        "GET request falhou",
+                        extra={
+                            "url": url,
+                            "error_type": type(error).__name__,
+                            "error_message": str(error),
+                            "response_time_ms": (time.perf_counter_ns() - start_ns) // 1_000_000,
+                            "attempt": attempt,
+                            "retryable": retryable
+                        }
+                    )
+                    if not retryable or attempt == max_attempts:
+                        raise
+
+            # Backoff fora do semáforo para não segurar uma vaga de concorrência
+            await asyncio.sleep(self.retry_handler._calculate_delay(attempt))
+
+    async def get_yahoo_quote(self, symbol: str) -> Dict[str, Any]:
+        """
+        Busca cotação de uma ação.
+
+        Args:
+            symbol: Símbolo da ação (ex: 'ASML.AS')
+
+        Returns:
+            Dict com dados da cotação
+        """
+        url = f"https://{YAHOO_HOST}/v8/finance/chart/{symbol}"
+
+        params = {
+            'interval': '1d',
+            'range': '1d',
+            'includePrePost': 'false'
+        }
+
+        return await self.get(url, params=params)
+
+    async def get_yahoo_quotes(self, symbols: List[str]) -> Dict[str, Any]:
+        """
+        Busca cotações de vários símbolos em paralelo.
+
+        Args:
+            symbols: Lista de símbolos
+
+        Returns:
+            Dict {symbol: dados}; símbolos que falharam são omitidos
+        """
+        results = await asyncio.gather(
+            *(self.get_yahoo_quote(symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+
+        quotes: Dict[str, Any] = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                self.logger.warning(
+                    f"Falha na cotação de {symbol}",
+                    extra={"symbol": symbol, "error_type": type(result).__name__, "error": str(result)}
+                )
+            else:
+                quotes[symbol] = result
+        return quotes
+
+    async def close(self):
+        """Fecha a sessão HTTP"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            self.logger.info("Sessão HTTP assíncrona fechada")
+
+    async def __aenter__(self):
+        """Async context manager support"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager cleanup"""
+        await self.close()
+
+
+def fetch_yahoo_quotes(symbols: List[str], **client_kwargs) -> Dict[str, Any]:
+    """
+    Wrapper bloqueante: busca cotações em paralelo via asyncio.run.
+
+    Args:
+        symbols: Lista de símbolos
+        **client_kwargs: Argumentos para AsyncYahooFinanceClient
+
+    Returns:
+        Dict {symbol: dados}
+    """
+    async def _run():
+        async with AsyncYahooFinanceClient(**client_kwargs) as client:
+            return await client.get_yahoo_quotes(symbols)
+
+    return asyncio.run(_run())
@@ -0,0 +1,155 @@
+"""
+File Cache
+==========
+
+Cache em disco com TTL para respostas das APIs: séries históricas não
+mudam durante o dia, então um acerto no cache evita a requisição HTTP
+(e o consumo de quota) por completo.
+
+DataFrames são gravados em Parquet; respostas JSON brutas em .json e
+corpos brutos (ex: CSV) com o sufixo informado.
+"""
+
+import os
+import time
+import threading
+import hashlib
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import pandas as pd
+
+from core.logger import setup_logger
+from core import json_utils
+
+
+# TTLs padrão: barras diárias/semanais/mensais vs. intraday
+DAILY_TTL = 86400
+INTRADAY_TTL = 3600
+
+
+class FileCache:
+    """
+    Cache chave -> arquivo com expiração pelo mtime do arquivo.
+    Gravações são atômicas (arquivo temporário + os.replace).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = '.cache',
+        ttl: float = DAILY_TTL,
+        namespace: Optional[str] = None
+    ):
+        """
+        Args:
+            cache_dir: Diretório base do cache
+            ttl: Validade padrão das entradas em segundos
+            namespace: Subdiretório por provedor (ex: 'twelvedata')
+        """
+        self.cache_dir = Path(cache_dir) / namespace if namespace else Path(cache_dir)
+        self.ttl = ttl
+        self.logger = setup_logger("scraper.file_cache")
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Gera a chave (md5) a partir dos parâmetros da requisição"""
+        return hashlib.md5(':'.join(map(str, parts)).encode('utf-8')).hexdigest()
+
+    def _fresh_path(self, key: str, suffix: str, ttl: Optional[float]) -> Optional[Path]:
+        """Retorna o caminho da entrada se existir e estiver dentro do TTL"""
+        path = self.cache_dir / f"{key}{suffix}"
+        try:
+            age = time.time() - path.stat().st_mtime
+        except OSError:
+            return None
+        return path if age <= (self.ttl if ttl is None else ttl) else None
+
+    def _write_atomic(self, path: Path, write) -> None:
+        """Grava via arquivo temporário para nunca expor entradas parciais"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # pid + thread: gravações concorrentes da mesma chave (ex: ThreadPoolExecutor
+        # do chart) nunca compartilham o arquivo temporário
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """
+        Busca DataFrame no cache.
+
+        Args:
+            key: Chave gerada por make_key
+            ttl: Validade em segundos (usa a padrão se None)
+
+        Returns:
+            DataFrame ou None se ausente, expirado ou ilegível
+        """
+        path = self._fresh_path(key, '.parquet', ttl)
+        if path is None:
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            self.logger.warning(
+                "Entrada de cache ilegível - ignorando",
+                extra={"path": str(path), "error_type": type(e).__name__}
+            )
+            return None
+
+    def set(self, key: str, df: pd.DataFrame) -> None:
+        """Grava DataFrame no cache (falhas são apenas logadas)"""
+        path = self.cache_dir / f"{key}.parquet"
+        try:
+            self._write_atomic(path, lambda tmp: df.to_parquet(tmp, compression='snappy', index=False))
+        except Exception as e:
+            self.logger.warning(
+                "Falha ao gravar cache",
+                extra={"path": str(path), "error_type": type(e).__name__, "error": str(e)}
+            )
+
+    def get_json(self, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """Busca resposta JSON no cache (None se ausente, expirada ou inválida)"""
+        path = self._fresh_path(key, '.json', ttl)
+        if path is None:
+            return None
+        try:
+            return json_utils.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def set_json(self, key: str, data: Any) -> None:
+        """Grava resposta JSON no cache (falhas são apenas logadas)"""
+        path = self.cache_dir / f"{key}.json"
+        try:
+            payload = json_utils.dumps(data).encode('utf-8')
+            self._write_atomic(path, lambda tmp: tmp.write_bytes(payload))
+        except Exception as e:
+            self.logger.warning(
+                "Falha ao gravar cache",
+                extra={"path": str(path), "error_type": type(e).__name__, "error": str(e)}
+            )
+
+    def get_bytes(self, key: str, suffix: str = '.bin', ttl: Optional[float] = None) -> Optional[bytes]:
+        """Busca conteúdo bruto (ex: CSV) no cache (None se ausente ou expirado)"""
+        path = self._fresh_path(key, suffix, ttl)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def set_bytes(self, key: str, data: bytes, suffix: str = '.bin') -> None:
+        """Grava conteúdo bruto no cache (falhas são apenas logadas)"""
+        path = self.cache_dir / f"{key}{suffix}"
+        try:
+            self._write_atomic(path, lambda tmp: tmp.write_bytes(data))
+        except Exception as e:
+            self.logger.warning(
+                "Falha ao gravar cache",
+                extra={"path": str(path), "error_type": type(e).__name__, "error": str(e)}
+            )
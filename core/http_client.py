@@ -1,12 +1,58 @@
 import requests
 import time
+import logging
+import functools
+from types import MappingProxyType
 from typing import Dict, Any, Optional, Union
 from urllib.parse import urljoin, urlparse
-from core.logger import setup_logger
+from core.logger import setup_logger, ContextLogger
+from core import json_utils
+from core.http_pool import get_session
 from core.rate_limiter import default_rate_limiter, RateLimiter
 from core.retry import with_retry, RetryConfig, RetryHandler
 
 
+YAHOO_HOST = "query1.finance.yahoo.com"
+_YAHOO_ORIGIN = f"https://{YAHOO_HOST}"
+
+# User-Agent do Firefox mais recente
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) "
+    "Gecko/20100101 Firefox/119.0"
+)
+
+# Headers que simulam comportamento humano/navegador
+STEALTH_HEADERS = MappingProxyType({
+    'User-Agent': _USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',  # Do Not Track
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+
+    # Headers Sec-Fetch para simular navegação real
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+
+    # Cache control
+    'Cache-Control': 'max-age=0'
+})
+
+
+# Headers do caso comum (host do Yahoo), montados uma vez
+_DEFAULT_HEADERS = MappingProxyType({**STEALTH_HEADERS, 'Referer': _YAHOO_ORIGIN})
+
+
+@functools.lru_cache(maxsize=256)
+def _referer_for(url: str) -> str:
+    """Origem (scheme://host) da URL, usada como Referer"""
+    parsed_url = urlparse(url)
+    return f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+
 class YahooFinanceClient:
     """
     Cliente HTTP especializado para Yahoo Finance com rate limiting,
@@ -17,7 +63,8 @@ class YahooFinanceClient:
         self,
         rate_limiter: RateLimiter = None,
         retry_config: RetryConfig = None,
-        timeout: int = 5
+        timeout: int = 5,
+        session: requests.Session = None
     ):
         """
         Inicializa o cliente HTTP.
@@ -26,15 +73,20 @@ class YahooFinanceClient:
             rate_limiter: Rate limiter personalizado (usa padrão se None)
             retry_config: Configuração de retry (usa padrão se None)
             timeout: Timeout em segundos para requisições
+            session: Sessão HTTP injetada (usa a compartilhada do host se None)
         """
         self.rate_limiter = rate_limiter or default_rate_limiter
         self.retry_handler = RetryHandler(retry_config or RetryConfig())
         self.timeout = timeout
         self.logger = setup_logger("scraper.http_client")
 
-        # Configurar sessão HTTP reutilizável para performance
-        self.session = requests.Session()
-        self._setup_session_headers()
+        # Sessão HTTP compartilhada por host (pool de conexões reutilizável).
+        # O cliente nunca a fecha: a do pool é de todos os clientes do processo
+        # e a injetada é de quem a passou
+        self.session = session or get_session(YAHOO_HOST)
+
+        # Headers stealth enviados por request, sem alterar a sessão compartilhada
+        self.headers = _DEFAULT_HEADERS
 
         self.logger.info(
             "Yahoo Finance HTTP client inicializado",
@@ -45,45 +97,6 @@ class YahooFinanceClient:
             }
         )
 
-    def _setup_session_headers(self):
-        """Configura headers stealth para simular navegador real"""
-
-        # User-Agent do Firefox mais recente
-        user_agent = (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) "
-            "Gecko/20100101 Firefox/119.0"
-        )
-
-        # Headers que simulam comportamento humano/navegador
-        stealth_headers = {
-            'User-Agent': user_agent,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',  # Do Not Track
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-
-            # Headers Sec-Fetch para simular navegação real
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-
-            # Cache control
-            'Cache-Control': 'max-age=0'
-        }
-
-        self.session.headers.update(stealth_headers)
-
-        self.logger.debug(
-            "Headers stealth configurados",
-            extra={
-                "user_agent": user_agent,
-                "headers_count": len(stealth_headers)
-            }
-        )
-
     def get(
         self,
         url: str,
@@ -148,14 +161,20 @@ class YahooFinanceClient:
         Returns:
             Response object
         """
-        # Preparar headers (merge com headers da sessão)
-        headers = kwargs.pop('headers', {}) or {}
-
-        # Adicionar Referer baseado na URL se não fornecido
-        if 'Referer' not in headers and 'referer' not in headers:
-            parsed_url = urlparse(url)
-            base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-            headers['Referer'] = base_url
+        # Preparar headers (stealth + Referer da URL + adicionais do chamador)
+        headers = kwargs.pop('headers', None)
+        referer = _referer_for(url)
+
+        if headers:
+            # Adicionar Referer baseado na URL se não fornecido
+            if 'Referer' not in headers and 'referer' not in headers:
+                headers = {**headers, 'Referer': referer}
+            headers = {**STEALTH_HEADERS, **headers}
+        elif referer == _YAHOO_ORIGIN:
+            # Caso comum: headers pré-montados, sem dict por request
+            headers = _DEFAULT_HEADERS
+        else:
+            headers = {**STEALTH_HEADERS, 'Referer': referer}
 
         # Configurar timeout se não fornecido
         timeout = kwargs.pop('timeout', self.timeout)
@@ -163,24 +182,25 @@ class YahooFinanceClient:
         # Request ID para tracking
         request_id = f"req_{int(time.time() * 1000)}"
 
+        # Contexto fixo do request, mesclado em todos os logs abaixo
+        log = ContextLogger(self.logger, {"request_id": request_id, "method": method, "url": url})
+
         def _execute_request():
             """Função interna que será executada com retry"""
 
             # Rate limiting - sempre aplicado antes da requisição
             self.rate_limiter.acquire()
 
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
 
-            self.logger.debug(
-                f"Executando {method} request",
-                extra={
-                    "request_id": request_id,
-                    "method": method,
-                    "url": url,
-                    "has_params": 'params' in kwargs,
-                    "timeout": timeout
-                }
-            )
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(
+                    f"Executando {method} request",
+                    extra={
+                        "has_params": 'params' in kwargs,
+                        "timeout": timeout
+                    }
+                )
 
             try:
                 # Fazer a requisição HTTP
@@ -192,18 +212,15 @@ class YahooFinanceClient:
                     **kwargs
                 )
 
-                response_time = time.time() - start_time
+                elapsed_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
                 # Log de sucesso
-                self.logger.info(
+                log.info(
                     f"{method} request bem-sucedida",
                     extra={
-                        "request_id": request_id,
-                        "method": method,
-                        "url": url,
                         "status_code": response.status_code,
-                        "response_time_ms": round(response_time * 1000, 2),
-                        "content_length": len(response.content),
+                        "response_time_ms": elapsed_ms,
+                        "content_length": int(response.headers.get('Content-Length', 0) or 0),
                         "content_type": response.headers.get('content-type', 'unknown')
                     }
                 )
@@ -214,18 +231,15 @@ class YahooFinanceClient:
                 return response
 
             except requests.exceptions.RequestException as e:
-                response_time = time.time() - start_time
+                elapsed_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
                 # Log de erro
-                self.logger.error(
+                log.error(
                     f"{method} request falhou",
                     extra={
-                        "request_id": request_id,
-                        "method": method,
-                        "url": url,
                         "error_type": type(e).__name__,
                         "error_message": str(e),
-                        "response_time_ms": round(response_time * 1000, 2),
+                        "response_time_ms": elapsed_ms,
                         "status_code": getattr(e.response, 'status_code', None) if hasattr(e, 'response') else None
                     }
                 )
@@ -245,7 +259,7 @@ class YahooFinanceClient:
         Returns:
             Dict com dados da cotação
         """
-        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+        url = f"https://{YAHOO_HOST}/v8/finance/chart/{symbol}"
 
         params = {
             'interval': '1d',
@@ -254,13 +268,16 @@ class YahooFinanceClient:
         }
 
         response = self.get(url, params=params)
-        return response.json()
+        return json_utils.loads(response.content)
 
     def close(self):
-        """Fecha a sessão HTTP"""
-        if self.session:
-            self.session.close()
-            self.logger.info("Sessão HTTP fechada")
+        """
+        No-op: o cliente não é dono da sessão HTTP.
+
+        Sessões do pool (core.http_pool) são fechadas por http_pool.close_all();
+        sessões injetadas ficam a cargo de quem as criou. Mantido para o uso
+        como context manager.
+        """
 
     def __enter__(self):
         """Context manager support"""
@@ -271,5 +288,16 @@ class YahooFinanceClient:
         self.close()
 
 
-# Instância global padrão
-default_client = YahooFinanceClient()
+# Instância global padrão (criada sob demanda no primeiro uso)
+@functools.lru_cache(maxsize=None)
+def get_default_client() -> YahooFinanceClient:
+    """Retorna o cliente Yahoo Finance global, criando-o na primeira chamada"""
+    return YahooFinanceClient()
+
+
+def __getattr__(name: str):
+    """Mantém `default_client` disponível sem instanciar no import (PEP 562)"""
+    if name == 'default_client':
+        return get_default_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
@@ -0,0 +1,67 @@
+"""
+HTTP Connection Pool
+====================
+
+Sessões requests compartilhadas por host: clientes que falam com o mesmo
+host reaproveitam o mesmo pool de conexões keep-alive (e o handshake TLS).
+
+Todas as sessões montam um único HTTPAdapter: cada host tem seu próprio
+pool dentro dele, mas o despachante de conexões (PoolManager) é um só,
+enquanto headers e cookies continuam separados por sessão.
+"""
+
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+_sessions: Dict[str, requests.Session] = {}
+_adapter: Optional[HTTPAdapter] = None
+_lock = threading.Lock()
+
+
+def _shared_adapter() -> HTTPAdapter:
+    """Adapter único para todos os hosts (chamar com lock)"""
+    global _adapter
+    if _adapter is None:
+        # Retry fica a cargo do RetryHandler, não do urllib3
+        _adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+    return _adapter
+
+
+def get_session(host: str) -> requests.Session:
+    """
+    Retorna a sessão compartilhada para o host, criando-a na primeira chamada.
+
+    Args:
+        host: Host de destino (ex: 'www.alphavantage.co')
+
+    Returns:
+        requests.Session montada sobre o HTTPAdapter compartilhado
+    """
+    session = _sessions.get(host)
+    if session is not None:
+        return session
+
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = _shared_adapter()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _sessions[host] = session
+
+    return session
+
+
+def close_all() -> None:
+    """Fecha todas as sessões compartilhadas"""
+    global _adapter
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _adapter = None
@@ -0,0 +1,40 @@
+"""
+JSON Utils
+==========
+
+Serialização/parse de JSON usando orjson quando disponível,
+com fallback transparente para a stdlib `json`.
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Faz parse de JSON a partir de bytes ou str.
+
+    Raises:
+        ValueError: Se o conteúdo não for JSON válido
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    Serializa objeto para JSON (UTF-8, sem escapar caracteres não-ASCII).
+
+    Args:
+        obj: Objeto a serializar
+        default: Conversor para tipos não suportados nativamente (ex: str)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, default=default)
@@ -1,9 +1,20 @@
 import logging
-import json
+import logging.handlers
 import os
+import queue
+import atexit
+import functools
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from core import json_utils
+
+# Atributos padrão de LogRecord; o resto veio do `extra=` da chamada
+_LOGRECORD_RESERVED = frozenset(
+    logging.LogRecord('', logging.INFO, '', 0, '', (), None).__dict__
+) | {'message', 'asctime', 'taskName'}
+
 
 class JSONFormatter(logging.Formatter):
     """Formatter personalizado para output JSON estruturado"""
@@ -16,23 +27,89 @@ class JSONFormatter(logging.Formatter):
             "message": record.getMessage()
         }
 
-        # Adiciona campos extras se existirem
-        if hasattr(record, 'extra') and record.extra:
-            log_entry["extra"] = record.extra
+        # Adiciona campos extras se existirem (logging os copia direto no record)
+        extras = {k: v for k, v in record.__dict__.items() if k not in _LOGRECORD_RESERVED}
+        if extras:
+            log_entry["extra"] = extras
+
+        return json_utils.dumps(log_entry, default=str)
+
+class ContextLogger(logging.LoggerAdapter):
+    """
+    LoggerAdapter que fixa campos de contexto (ex: request_id) uma única vez
+    e os mescla com o `extra=` de cada chamada.
+    """
+
+    def process(self, msg, kwargs):
+        extra = kwargs.get('extra')
+        kwargs['extra'] = {**self.extra, **extra} if extra else self.extra
+        return msg, kwargs
+
+
+class _FileRouter(logging.Handler):
+    """Encaminha cada record para o(s) FileHandler(s) do logger de origem"""
+
+    def __init__(self):
+        super().__init__()
+        self._handlers: Dict[str, List[logging.FileHandler]] = {}
+
+    def add(self, name: str, handler: logging.FileHandler) -> None:
+        self._handlers.setdefault(name, []).append(handler)
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        for handler in self._handlers.get(record.name, ()):
+            handler.handle(record)
+        return True
+
+    def close(self) -> None:
+        for handlers in self._handlers.values():
+            for handler in handlers:
+                handler.close()
+        super().close()
 
-        return json.dumps(log_entry, ensure_ascii=False)
 
+# Fila única: as chamadas de log só fazem queue.put; serialização JSON e
+# escrita em disco acontecem na thread do QueueListener
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_router = _FileRouter()
+_listener = logging.handlers.QueueListener(_log_queue, _router, respect_handler_level=True)
+_listener_started = False
+_setup_lock = threading.Lock()
+
+
+def _ensure_listener() -> None:
+    """Inicia o QueueListener uma única vez por processo"""
+    global _listener_started
+    if not _listener_started:
+        _listener.start()
+        atexit.register(_listener.stop)
+        _listener_started = True
+
+
+@functools.lru_cache(maxsize=None)
 def setup_logger(name: str = "scraper", level: str = "INFO", log_dir: str = "logs") -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper()))  # Define o nível mínimo (mensagens abaixo são ignoradas)
     logger.propagate = False  # Evita mensagens duplicadas se root logger também estiver configurado
-    log_path = Path(log_dir)
-    log_path.mkdir(parents=True, exist_ok=True)
-    log_file = log_path / f"{name}_{datetime.now().strftime('%Y-%m-%d')}.ndjson"
-    if not any(isinstance(h, logging.FileHandler) and h.baseFilename == str(log_file) for h in logger.handlers):
+
+    with _setup_lock:
+        # Sentinela: handlers já configurados para este logger
+        if getattr(logger, '_scraper_configured', False):
+            return logger
+
+        log_path = Path(log_dir)
+        log_path.mkdir(parents=True, exist_ok=True)
+        log_file = log_path / f"{name}_{datetime.now().strftime('%Y-%m-%d')}.ndjson"
+
+        _ensure_listener()
+
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setFormatter(JSONFormatter())
-        logger.addHandler(file_handler)
+        _router.add(name, file_handler)
+
+        logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+        logger._scraper_configured = True
+
     return logger
 
 # Logger global
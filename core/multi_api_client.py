@@ -7,27 +7,71 @@ Wrapper that attempts to fetch historical data from multiple providers in order:
 2. Twelve Data (requires key, fallback)
 3. Alpha Vantage (existing client)
 
+The provider that last succeeded for a symbol is tried first, and a provider
+that fails repeatedly is skipped for a while (circuit breaker).
+
 Exposes: get_historical_data(symbol, period, interval) and download_multiple(symbols,...)
 """
 
-from typing import List, Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from typing import List, Dict, Any, Iterator, Optional
 from core.yahoo_finance_client import default_yahoo_client
+from core.http_client import YAHOO_HOST
 from core.twelvedata_client import default_twelvedata_client
-from core.alphavantage_client import default_alphavantage_client
+from core.alphavantage_client import get_default_alphavantage_client
 from core.logger import setup_logger
+from core import json_utils
+import numpy as np
+import pandas as pd
 import time
 
 
+# Yahoo's spark endpoint accepts several symbols per URL (large batches fail)
+SPARK_URL = f"https://{YAHOO_HOST}/v8/finance/spark"
+SPARK_BATCH_SIZE = 20
+
+# Default fallback order; the per-symbol best provider is moved to the head
+PROVIDERS = ('yahoo', 'twelvedata', 'alphavantage')
+
+# Consecutive failures that open a provider's circuit, and for how long
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_OPEN_SECONDS = 60.0
+
+# Symbols remembered in the best-provider LRU
+BEST_PROVIDER_CACHE_SIZE = 1024
+
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    """Yield consecutive slices of `items` with at most `size` elements."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
 class MultiApiClient:
     def __init__(self):
         self.yahoo = default_yahoo_client
         self.td = default_twelvedata_client
-        self.av = default_alphavantage_client
         self.logger = setup_logger('scraper.multi_api_client')
 
-    def get_historical_data(self, symbol: str, period: str = 'max', interval: str = '1d'):
-        """Try providers in order and return first successful DataFrame or None."""
-        # 1) Yahoo
+        # Provider health, shared by the download_multiple worker threads
+        self._provider_success: 'OrderedDict[str, str]' = OrderedDict()
+        self._provider_fail_count: Dict[str, int] = {}
+        self._circuit_open_until: Dict[str, float] = {}
+        self._health_lock = threading.Lock()
+
+        # Single-flight: concurrent calls for the same key share one fetch
+        self._inflight: Dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    @property
+    def av(self):
+        """AlphaVantage client, created on first use (it requires an API key)."""
+        return get_default_alphavantage_client()
+
+    def _try_yahoo(self, symbol: str, period: str, interval: str):
+        """Yahoo attempt; returns a non-empty DataFrame or None."""
         try:
             df = self.yahoo.get_historical_data(symbol=symbol, period=period, interval=interval)
             if df is not None and len(df) > 0:
@@ -35,20 +79,22 @@ class MultiApiClient:
                 return df
         except Exception:
             self.logger.exception('Yahoo failed for %s', symbol)
+        return None
 
-        # 2) Twelve Data (if key configured)
+    def _try_twelvedata(self, symbol: str):
+        """Twelve Data attempt; returns a non-empty DataFrame or None."""
         try:
-            df = None
-            if self.td and getattr(self.td, 'api_key', None):
-                # Twelve Data uses outputsize instead of period; map simple periods
-                df = self.td.get_time_series(symbol=symbol, interval='1day')
+            # Twelve Data uses outputsize instead of period; map simple periods
+            df = self.td.get_time_series(symbol=symbol, interval='1day')
             if df is not None and len(df) > 0:
                 self.logger.info('Using Twelve Data for %s', symbol)
                 return df
         except Exception:
             self.logger.exception('Twelve Data failed for %s', symbol)
+        return None
 
-        # 3) Alpha Vantage
+    def _try_alphavantage(self, symbol: str, interval: str):
+        """Alpha Vantage attempt; returns a DataFrame or None."""
         try:
             data = self.av.get_data_for_interval(symbol=symbol, interval=interval, outputsize='full')
             if data:
@@ -56,15 +102,145 @@ class MultiApiClient:
                 df = self._alphavantage_json_to_df(data)
                 if df is not None:
                     self.logger.info('Using AlphaVantage for %s', symbol)
-                    return df
-                else:
-                    return None
+                return df
         except Exception:
             self.logger.exception('AlphaVantage failed for %s', symbol)
+        return None
+
+    def _provider_available(self, name: str) -> bool:
+        """False while the provider's circuit is open or it isn't configured."""
+        if name == 'twelvedata' and not (self.td and getattr(self.td, 'api_key', None)):
+            return False
+        return self._circuit_open_until.get(name, 0.0) <= time.monotonic()
+
+    def _limiter_wait(self, name: str) -> float:
+        """Seconds the provider's rate limiter would hold its next request (0 if it has none)."""
+        client = {'yahoo': self.yahoo, 'twelvedata': self.td}.get(name)
+        limiter = getattr(client, 'rate_limiter', None)
+        if limiter is None or not hasattr(limiter, 'get_status'):
+            return 0.0
+        return float(limiter.get_status().get('time_until_next_request', 0.0))
+
+    def _provider_order(self, symbol: str) -> List[str]:
+        """Available providers, with the last one that succeeded for `symbol` first."""
+        order = list(PROVIDERS)
+        best = self._provider_success.get(symbol)
+        if best:
+            order.remove(best)
+            order.insert(0, best)
+        return [name for name in order if self._provider_available(name)]
 
-        self.logger.warning('All providers failed for %s', symbol)
+    def _record_result(self, name: str, symbol: str, ok: bool) -> None:
+        """Update the best-provider LRU and the provider's circuit breaker."""
+        with self._health_lock:
+            if ok:
+                self._provider_fail_count[name] = 0
+                self._provider_success[symbol] = name
+                self._provider_success.move_to_end(symbol)
+                if len(self._provider_success) > BEST_PROVIDER_CACHE_SIZE:
+                    self._provider_success.popitem(last=False)
+                return
+
+            failures = self._provider_fail_count.get(name, 0) + 1
+            if failures >= CIRCUIT_FAILURE_THRESHOLD:
+                self._circuit_open_until[name] = time.monotonic() + CIRCUIT_OPEN_SECONDS
+                failures = 0
+                self.logger.warning('Circuit open for %s after %d consecutive failures; skipping for %.0fs',
+                                    name, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_OPEN_SECONDS)
+            self._provider_fail_count[name] = failures
+
+    def _attempt(self, name: str, symbol: str, period: str, interval: str):
+        """Run one provider attempt and record its outcome."""
+        if name == 'yahoo':
+            df = self._try_yahoo(symbol, period, interval)
+        elif name == 'twelvedata':
+            df = self._try_twelvedata(symbol)
+        else:
+            df = self._try_alphavantage(symbol, interval)
+        self._record_result(name, symbol, df is not None)
+        return df
+
+    def _race(self, names: List[str], symbol: str, period: str, interval: str, stagger: float):
+        """Start names[0]; after `stagger` seconds (or its failure) race the rest against it."""
+        executor = ThreadPoolExecutor(max_workers=len(names))
+        try:
+            first = executor.submit(self._attempt, names[0], symbol, period, interval)
+            wait([first], timeout=stagger)
+            if first.done() and first.result() is not None:
+                return first.result()
+
+            futures = [] if first.done() else [first]
+            futures += [executor.submit(self._attempt, name, symbol, period, interval) for name in names[1:]]
+
+            for future in as_completed(futures):
+                df = future.result()
+                if df is not None:
+                    return df
+        finally:
+            # Don't wait for the losing request; it finishes in the background
+            executor.shutdown(wait=False, cancel_futures=True)
         return None
 
+    def get_historical_data(self, symbol: str, period: str = 'max', interval: str = '1d',
+                            stagger: float = 5.0):
+        """Return the first successful DataFrame across providers, or None.
+
+        Concurrent calls for the same (symbol, period, interval) are collapsed
+        into one fetch whose result all callers share.
+        """
+        key = (symbol, period, interval)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(self._fetch_historical(symbol, period, interval, stagger))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+        return future.result()
+
+    def _fetch_historical(self, symbol: str, period: str, interval: str, stagger: float):
+        """Provider fallback behind get_historical_data.
+
+        The preferred provider (Yahoo, or whichever last succeeded for this
+        symbol) starts immediately; if it hasn't answered within `stagger`
+        seconds (or already failed), the next one is raced against it and the
+        first non-empty result wins. Alpha Vantage is never used as the hedge,
+        since its daily quota is the scarcest; remaining providers run in order.
+
+        No hedge is started while the preferred provider is held by its own rate
+        limiter: that wait is not slowness, and counting it against `stagger`
+        would spend Twelve Data credits on nearly every call under
+        download_multiple. A losing request can't be interrupted and finishes
+        in the background (its outcome still feeds the circuit breaker).
+        """
+        order = self._provider_order(symbol)
+
+        hedge = (
+            len(order) > 1
+            and order[1] != 'alphavantage'
+            and self._limiter_wait(order[0]) == 0.0
+        )
+        hedged = order[:2] if hedge else order[:1]
+        df = self._race(hedged, symbol, period, interval, stagger) if hedged else None
+
+        for name in order[len(hedged):]:
+            if df is not None:
+                break
+            df = self._attempt(name, symbol, period, interval)
+
+        if df is None:
+            self.logger.warning('All providers failed for %s', symbol)
+        return df
+
     def _alphavantage_json_to_df(self, data: dict):
         """Try to coerce AlphaVantage JSON into a pandas DataFrame similar to other clients.
 
@@ -76,43 +252,97 @@ class MultiApiClient:
                 if k.lower().startswith('time series') and isinstance(data[k], dict):
                     ts = data[k]
                     # ts: {date_str: { '1. open': '...', '2. high': '...', ... }}
-                    import pandas as pd
-                    rows = []
-                    for dt, vals in ts.items():
-                        row = {'datetime': pd.to_datetime(dt)}
-                        # Extract numeric fields
-                        for field_key, field_val in vals.items():
-                            # field_key like '1. open' -> 'open'
-                            name = field_key.split('. ', 1)[-1].strip() if '. ' in field_key else field_key
-                            row[name] = float(field_val) if field_val not in (None, '') else None
-                        rows.append(row)
-                    df = pd.DataFrame(rows)
-                    # Normalize column names to match other clients
-                    rename_map = {}
-                    if 'open' in df.columns:
-                        rename_map['open'] = 'open'
-                    if 'high' in df.columns:
-                        rename_map['high'] = 'high'
-                    if 'low' in df.columns:
-                        rename_map['low'] = 'low'
-                    if 'close' in df.columns:
-                        rename_map['close'] = 'close'
-                    if 'volume' in df.columns:
-                        rename_map['volume'] = 'volume'
+                    # One pass: dates become the index, numeric casts happen in C
+                    df = pd.DataFrame.from_dict(ts, orient='index')
+                    # '1. open' -> 'open'
+                    df.columns = [c.split('. ', 1)[-1].strip() for c in df.columns]
+                    try:
+                        df = df.astype('float64')
+                    except (TypeError, ValueError):
+                        # Empty/unparseable values: coerce them to NaN instead
+                        df = df.apply(pd.to_numeric, errors='coerce').astype('float64')
+                    df.index = pd.to_datetime(df.index)
+                    df.index.name = 'datetime'
+                    df = df.reset_index()
 
                     # Ensure datetime and date
                     df['date'] = df['datetime'].dt.strftime('%Y-%m-%d')
                     column_order = ['datetime', 'date', 'open', 'high', 'low', 'close', 'volume']
                     df = df[[c for c in column_order if c in df.columns]]
-                    # Sort ascending by datetime
-                    df = df.sort_values('datetime').reset_index(drop=True)
+                    # Alpha Vantage lists newest first: reverse instead of sorting
+                    if df['datetime'].is_monotonic_decreasing:
+                        df = df.iloc[::-1].reset_index(drop=True)
+                    elif not df['datetime'].is_monotonic_increasing:
+                        df = df.sort_values('datetime', kind='mergesort').reset_index(drop=True)
                     return df
         except Exception:
             self.logger.exception('Failed to convert AlphaVantage JSON to DataFrame')
             return None
 
-    def download_multiple(self, symbols: List[str], period: str = 'max', interval: str = '1d') -> Dict[str, Any]:
-        """Attempt batch download: prefer Yahoo's batch, then fallback per-symbol."""
+    def _yahoo_batch_fetch(self, symbols: List[str], period: str = 'max', interval: str = '1d') -> Dict[str, Any]:
+        """Fetch up to SPARK_BATCH_SIZE symbols in one Yahoo spark request.
+
+        Returns {symbol: DataFrame} for the symbols that came back with full
+        open/high/low/close bars. Spark usually sends only closes; those symbols
+        are left out so download_multiple fetches their OHLCV per symbol.
+        """
+        response = self.yahoo.get(
+            SPARK_URL,
+            params={'symbols': ','.join(symbols), 'range': period, 'interval': interval}
+        )
+        data = json_utils.loads(response.content)
+
+        results: Dict[str, Any] = {}
+        for item in (data.get('spark') or {}).get('result') or []:
+            symbol = item.get('symbol')
+            for payload in item.get('response') or []:
+                timestamps = payload.get('timestamp')
+                quotes = (payload.get('indicators') or {}).get('quote') or [{}]
+                if not symbol or not timestamps:
+                    continue
+
+                # Columns go straight from the decoded lists to typed arrays (null -> NaN)
+                columns = {'datetime': pd.to_datetime(timestamps, unit='s')}
+                for col in ('open', 'high', 'low', 'close', 'volume'):
+                    if quotes[0].get(col) is not None:
+                        columns[col] = np.asarray(quotes[0][col], dtype=np.float64)
+
+                # Misaligned payload: leave the symbol to the per-symbol fallback
+                if any(len(values) != len(timestamps) for values in columns.values()):
+                    continue
+
+                # Volume stays integer unless Yahoo sent gaps
+                volume = columns.get('volume')
+                if volume is not None and not np.isnan(volume).any():
+                    columns['volume'] = volume.astype(np.int64)
+
+                # Close-only payload: not a full bar, leave it to the per-symbol fallback
+                if any(col not in columns for col in ('open', 'high', 'low', 'close')):
+                    continue
+
+                df = pd.DataFrame(columns, copy=False)
+
+                # Same shape as endpoints/chart.py (date as datetime64 at midnight)
+                df['date'] = df['datetime'].dt.normalize()
+                column_order = ['datetime', 'date', 'open', 'high', 'low', 'close', 'volume']
+                results[symbol] = df[[c for c in column_order if c in df.columns]]
+        return results
+
+    def _fetch_fallback(self, symbol: str, period: str, interval: str):
+        """Per-symbol fallback used by download_multiple; returns DataFrame or None."""
+        try:
+            return self.get_historical_data(symbol=symbol, period=period, interval=interval)
+        except Exception:
+            self.logger.exception('Per-symbol fallback failed for %s', symbol)
+            return None
+
+    def download_multiple(self, symbols: List[str], period: str = 'max', interval: str = '1d',
+                          max_workers: int = 8) -> Dict[str, Any]:
+        """Attempt batch download: prefer Yahoo's batch, then fallback per-symbol.
+
+        Missing symbols are fetched concurrently (up to `max_workers` threads) so
+        their round-trips overlap; each provider's rate limiter still caps throughput.
+        """
         results: Dict[str, Any] = {}
 
         # Try Yahoo batch
@@ -129,16 +359,22 @@ class MultiApiClient:
             self.logger.exception('Yahoo batch failed, will fallback per-symbol')
             missing = symbols
 
-        # Per-symbol fallback for missing
-        for s in missing:
-            df = None
-            try:
-                df = self.get_historical_data(symbol=s, period=period, interval=interval)
-            except Exception:
-                self.logger.exception('Per-symbol fallback failed for %s', s)
+        # Batch the remaining symbols through Yahoo spark (one request per chunk)
+        if missing:
+            for chunk in _chunks(missing, SPARK_BATCH_SIZE):
+                try:
+                    results.update(self._yahoo_batch_fetch(chunk, period=period, interval=interval))
+                except Exception:
+                    self.logger.exception('Yahoo spark batch failed for %s', ','.join(chunk))
+            missing = [s for s in missing if s not in results]
 
-            if df is not None:
-                results[s] = df
+        # Per-symbol fallback for missing, fetched concurrently
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+                frames = executor.map(lambda s: self._fetch_fallback(s, period, interval), missing)
+                for s, df in zip(missing, frames):
+                    if df is not None:
+                        results[s] = df
 
         return results
 
@@ -1,60 +1,105 @@
+import os
 import time
-from typing import Optional
+import logging
+import asyncio
+import threading
+from pathlib import Path
+from typing import Optional, Sequence, Union
 from core.logger import setup_logger
+from core import json_utils
+from core.retry import parse_retry_after
 
 
 class RateLimiter:
     """
     Rate limiter para controlar velocidade de requisições ao Yahoo Finance.
     Evita bloqueios respeitando limites de requisições por minuto.
+
+    Implementado como token bucket: os tokens são repostos "just in time"
+    a partir de time.monotonic(), sem polling e imune a ajustes do relógio.
+    O crédito acumulado em períodos ociosos permite rajadas de até `capacity`
+    requisições imediatas, mantendo a média de requests_per_minute.
     """
 
-    def __init__(self, requests_per_minute: int = 10):
+    def __init__(self, requests_per_minute: int = 10, capacity: Optional[int] = None):
         """
         Args:
             requests_per_minute: Número máximo de requisições por minuto (padrão: 15)
+            capacity: Tamanho máximo da rajada (padrão: requests_per_minute)
         """
         self.requests_per_minute = requests_per_minute
         self.min_interval = 60.0 / requests_per_minute  # segundos entre requisições
-        self.last_request_time: Optional[float] = None
+        self.refill_rate = requests_per_minute / 60.0  # tokens por segundo
+        self.capacity = float(capacity if capacity is not None else requests_per_minute)
+
+        # Estado do bucket (protegido por lock)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
         self.logger = setup_logger("scraper.rate_limiter")
 
         self.logger.info(
             "Rate limiter inicializado",
             extra={
                 "requests_per_minute": requests_per_minute,
-                "min_interval_seconds": self.min_interval
+                "min_interval_seconds": self.min_interval,
+                "capacity": self.capacity
             }
         )
 
-    def acquire(self) -> None:
+    def _refill(self, now: float) -> None:
+        """Repõe tokens proporcionalmente ao tempo decorrido (chamar com lock)"""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+        self._last_refill = now
+
+    def try_acquire(self, cost: float = 1) -> bool:
+        """
+        Tenta consumir `cost` tokens sem bloquear.
+
+        Returns:
+            True se a requisição foi liberada, False se não há tokens suficientes
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < cost:
+                return False
+            self._tokens -= cost
+            return True
+
+    def acquire(self, cost: float = 1) -> None:
         """
         Espera o tempo necessário antes de permitir a próxima requisição.
         Chame este método antes de cada requisição HTTP.
-        """
-        current_time = time.time()
 
-        if self.last_request_time is not None:
-            # Calcula quanto tempo passou desde a última requisição
-            time_since_last = current_time - self.last_request_time
+        A vaga é reservada sob lock (o saldo pode ficar negativo) e a espera
+        acontece fora dele: cada thread calcula seu tempo a partir do próximo
+        slot livre, sem segurar as demais durante o sleep.
 
-            # Se não passou tempo suficiente, espera
-            if time_since_last < self.min_interval:
-                sleep_time = self.min_interval - time_since_last
+        Args:
+            cost: Quantidade de tokens consumidos pela requisição
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= cost
+            tokens = self._tokens
+        # Tempo exato até a reserva ser coberta pela reposição
+        sleep_time = -tokens / self.refill_rate if tokens < 0 else 0.0
 
+        if sleep_time > 0:
+            # Guarda evita montar o dict de extra quando INFO está desligado
+            if self.logger.isEnabledFor(logging.INFO):
                 self.logger.info(
                     "Rate limiting ativo - aguardando intervalo",
                     extra={
                         "sleep_time_seconds": round(sleep_time, 2),
-                        "time_since_last_request": round(time_since_last, 2),
+                        "tokens_available": round(tokens, 3),
                         "min_interval_required": self.min_interval
                     }
                 )
-
-                time.sleep(sleep_time)
-
-        # Atualiza o timestamp da última requisição
-        self.last_request_time = time.time()
+            time.sleep(sleep_time)
 
         self.logger.debug("Requisição liberada pelo rate limiter")
 
@@ -63,17 +108,26 @@ class RateLimiter:
         Reseta o rate limiter, permitindo requisição imediata na próxima chamada.
         Útil para testes ou reinicialização.
         """
-        self.last_request_time = None
+        with self._lock:
+            self._tokens = self.capacity
+            self._last_refill = time.monotonic()
         self.logger.info("Rate limiter resetado")
 
-    def handle_429_error(self, backoff_multiplier: float = 2.0) -> None:
+    def handle_429_error(
+        self,
+        backoff_multiplier: float = 2.0,
+        retry_after: Union[str, float, None] = None
+    ) -> None:
         """
         Aplica backoff adicional quando detecta 429 (Too Many Requests).
 
         Args:
             backoff_multiplier: Multiplicador para aumentar o intervalo temporariamente
+            retry_after: Valor do header Retry-After (tem prioridade sobre o multiplicador)
         """
-        additional_wait = self.min_interval * backoff_multiplier
+        additional_wait = parse_retry_after(retry_after)
+        if additional_wait is None:
+            additional_wait = self.min_interval * backoff_multiplier
 
         self.logger.warning(
             f"HTTP 429 detectado - aplicando backoff adicional",
@@ -87,8 +141,11 @@ class RateLimiter:
         # Força uma pausa extra
         time.sleep(additional_wait)
 
-        # Atualiza o timestamp como se tivesse feito uma requisição
-        self.last_request_time = time.time()
+        # Esvazia o bucket como se tivesse feito uma requisição
+        # (mantendo reservas pendentes de outras threads)
+        with self._lock:
+            self._tokens = min(self._tokens, 0.0)
+            self._last_refill = time.monotonic()
 
     def get_status(self) -> dict:
         """
@@ -97,22 +154,226 @@ class RateLimiter:
         Returns:
             Dict com informações sobre o estado atual
         """
-        current_time = time.time()
+        with self._lock:
+            self._refill(time.monotonic())
+            tokens = self._tokens
 
-        if self.last_request_time is None:
-            time_until_next = 0
-        else:
-            time_since_last = current_time - self.last_request_time
-            time_until_next = max(0, self.min_interval - time_since_last)
+        time_until_next = max(0.0, (1 - tokens) / self.refill_rate)
 
         return {
             "requests_per_minute": self.requests_per_minute,
             "min_interval_seconds": self.min_interval,
+            "capacity": self.capacity,
+            "tokens_available": round(tokens, 3),
             "time_until_next_request": round(time_until_next, 2),
             "can_request_now": time_until_next == 0
         }
 
 
+class AsyncRateLimiter:
+    """
+    Versão asyncio do RateLimiter (mesmo token bucket).
+    A espera usa asyncio.sleep, liberando o event loop para outras requisições.
+    """
+
+    def __init__(self, requests_per_minute: int = 10, capacity: Optional[int] = None):
+        """
+        Args:
+            requests_per_minute: Número máximo de requisições por minuto
+            capacity: Tamanho máximo da rajada (padrão: requests_per_minute)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.min_interval = 60.0 / requests_per_minute
+        self.refill_rate = requests_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else requests_per_minute)
+
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock: asyncio.Lock = None  # criado sob demanda dentro do event loop
+        self.logger = setup_logger("scraper.rate_limiter")
+
+    def _refill(self, now: float) -> None:
+        """Repõe tokens proporcionalmente ao tempo decorrido (chamar com lock)"""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+        self._last_refill = now
+
+    async def acquire(self) -> None:
+        """Aguarda (sem bloquear o event loop) até haver um token disponível"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            self._refill(time.monotonic())
+
+            if self._tokens < 1:
+                sleep_time = (1 - self._tokens) / self.refill_rate
+
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(
+                        "Rate limiting ativo - aguardando intervalo",
+                        extra={
+                            "sleep_time_seconds": round(sleep_time, 2),
+                            "tokens_available": round(self._tokens, 3),
+                            "min_interval_required": self.min_interval
+                        }
+                    )
+
+                await asyncio.sleep(sleep_time)
+                self._refill(time.monotonic())
+
+            self._tokens = max(0.0, self._tokens - 1)
+
+
+class TokenBucket:
+    """
+    Token bucket simples (sem lock; a sincronização fica com o chamador).
+
+    Com `state_file`, o estado é persistido em disco e usa o relógio de parede
+    (time.time) para que o saldo sobreviva a reinícios do processo.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        state_file: Optional[Union[str, Path]] = None
+    ):
+        """
+        Args:
+            rate: Tokens repostos por segundo
+            capacity: Máximo de tokens acumulados
+            state_file: Arquivo JSON para persistir o estado (opcional)
+        """
+        self.rate = rate
+        self.capacity = float(capacity)
+        self.state_file = Path(state_file) if state_file else None
+        self._clock = time.time if self.state_file else time.monotonic
+        self.tokens = self.capacity
+        self.last_refill = self._clock()
+        self._load_state()
+
+    def _load_state(self) -> None:
+        """Restaura saldo salvo (ignora arquivo ausente ou inválido)"""
+        if self.state_file is None:
+            return
+        try:
+            state = json_utils.loads(self.state_file.read_bytes())
+            self.tokens = min(self.capacity, float(state['tokens']))
+            self.last_refill = float(state['updated_at'])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _save_state(self) -> None:
+        """Grava o saldo atual de forma atômica (tmp + rename)"""
+        if self.state_file is None:
+            return
+        tmp_file = self.state_file.with_suffix('.tmp')
+        try:
+            tmp_file.write_text(
+                json_utils.dumps({"tokens": self.tokens, "updated_at": self.last_refill}),
+                encoding='utf-8'
+            )
+            os.replace(tmp_file, self.state_file)
+        except OSError:
+            setup_logger("scraper.rate_limiter").warning(
+                "Não foi possível persistir estado do rate limiter",
+                extra={"state_file": str(self.state_file)}
+            )
+
+    def refill(self) -> None:
+        """Repõe tokens proporcionalmente ao tempo decorrido"""
+        now = self._clock()
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.last_refill = now
+
+    def wait_time(self, cost: float = 1.0) -> float:
+        """Segundos até haver `cost` tokens disponíveis (0 se já houver)"""
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+    def consume(self, cost: float = 1.0) -> None:
+        """Debita tokens (chamar após confirmar wait_time() == 0)"""
+        self.tokens -= cost
+        self._save_state()
+
+    def reset(self) -> None:
+        """Enche o bucket novamente"""
+        self.tokens = self.capacity
+        self.last_refill = self._clock()
+        self._save_state()
+
+
+class CompositeTokenBucket:
+    """
+    Rate limiter hierárquico: uma requisição só é liberada quando TODOS os
+    buckets têm token (ex: limite por minuto + cota diária).
+    Mesma interface de acquire() do RateLimiter.
+    """
+
+    def __init__(self, buckets: Sequence[TokenBucket]):
+        """
+        Args:
+            buckets: Buckets que precisam liberar cada requisição
+        """
+        self.buckets = list(buckets)
+        self._lock = threading.Lock()
+        self.logger = setup_logger("scraper.rate_limiter")
+
+    def try_acquire(self, cost: float = 1.0) -> bool:
+        """
+        Tenta liberar uma requisição sem esperar.
+
+        Returns:
+            True se todos os buckets tinham token (e foram debitados)
+        """
+        with self._lock:
+            for bucket in self.buckets:
+                bucket.refill()
+            if any(bucket.wait_time(cost) > 0 for bucket in self.buckets):
+                return False
+            for bucket in self.buckets:
+                bucket.consume(cost)
+            return True
+
+    def acquire(self, cost: float = 1.0) -> None:
+        """
+        Espera até que todos os buckets liberem a requisição.
+        Chame este método antes de cada requisição HTTP.
+        """
+        while True:
+            with self._lock:
+                for bucket in self.buckets:
+                    bucket.refill()
+                sleep_time = max(bucket.wait_time(cost) for bucket in self.buckets)
+
+                if sleep_time <= 0:
+                    for bucket in self.buckets:
+                        bucket.consume(cost)
+                    return
+
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "Rate limiting ativo - aguardando intervalo",
+                    extra={
+                        "sleep_time_seconds": round(sleep_time, 2),
+                        "tokens_available": [round(bucket.tokens, 3) for bucket in self.buckets]
+                    }
+                )
+            time.sleep(sleep_time)
+
+    def reset(self) -> None:
+        """Enche todos os buckets novamente"""
+        with self._lock:
+            for bucket in self.buckets:
+                bucket.reset()
+        self.logger.info("Rate limiter resetado")
+
+
 # Instância global para uso em todo o projeto (mais conservador para Yahoo Finance)
 default_rate_limiter = RateLimiter(requests_per_minute=3)  # Muito conservador: 20s entre requests
 
@@ -1,10 +1,52 @@
 import time
+import logging
 import random
 import functools
+from email.utils import parsedate_to_datetime
 from typing import Callable, Any, List, Type, Optional, Union
+import requests
 from core.logger import setup_logger
 
 
+# Erros de rede/timeout (requests library), montados uma única vez
+_RETRYABLE_EXC = (
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError
+)
+
+
+def parse_retry_after(value: Union[str, float, None]) -> Optional[float]:
+    """
+    Converte o header Retry-After em segundos de espera.
+
+    Aceita segundos (ex: '30') ou data HTTP (ex: 'Wed, 21 Oct 2015 07:28:00 GMT').
+
+    Returns:
+        Segundos (>= 0) ou None se ausente/inválido
+    """
+    if value is None or value == '':
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _http_status(error: Exception) -> Optional[int]:
+    """Status HTTP de um requests.HTTPError (None para outros erros)"""
+    if isinstance(error, requests.exceptions.HTTPError):
+        # Comparar com None: Response é falsy para status >= 400
+        response = getattr(error, 'response', None)
+        if response is not None:
+            return response.status_code
+    return None
+
+
 class RetryConfig:
     def __init__(
         self,
@@ -28,6 +70,11 @@ class RetryConfig:
         self.backoff_factor = backoff_factor
         self.jitter = jitter
 
+        # Delays já limitados por tentativa (índice = attempt - 1), calculados uma vez
+        self.delay_schedule = [
+            min(base_delay * (backoff_factor ** i), max_delay) for i in range(max_attempts)
+        ]
+
 
 class RetryableError(Exception):
     """Exceção que indica que a operação pode ser tentada novamente"""
@@ -54,19 +101,18 @@ class RetryHandler:
         Returns:
             Delay em segundos
         """
-        # Exponential backoff: base_delay * (backoff_factor ^ (attempt - 1))
-        delay = self.config.base_delay * (self.config.backoff_factor ** (attempt - 1))
-
-        # Aplica o limite máximo
-        delay = min(delay, self.config.max_delay)
-
-        # Adiciona jitter se habilitado (±25% de variação)
+        # Exponential backoff: base_delay * (backoff_factor ^ (attempt - 1)), pré-calculado
+        if attempt <= len(self.config.delay_schedule):
+            delay = self.config.delay_schedule[attempt - 1]
+        else:
+            delay = min(self.config.base_delay * (self.config.backoff_factor ** (attempt - 1)),
+                        self.config.max_delay)
+
+        # Adiciona jitter se habilitado (±25% de variação) para dessincronizar retries
         if self.config.jitter:
-            jitter_range = delay * 0.25
-            delay += random.uniform(-jitter_range, jitter_range)
-            delay = max(0, delay)  # Garante que não seja negativo
+            delay *= 0.75 + random.random() * 0.5
 
-        return delay
+        return max(0.0, delay)
 
     def _is_retryable_error(self, error: Exception) -> bool:
         """
@@ -83,15 +129,12 @@ class RetryHandler:
             return True
 
         # Erros de rede/timeout (requests library)
-        import requests
-        if isinstance(error, (requests.exceptions.Timeout,
-                             requests.exceptions.ConnectionError,
-                             requests.exceptions.ChunkedEncodingError)):
+        if isinstance(error, _RETRYABLE_EXC):
             return True
 
         # HTTP errors específicos
         if isinstance(error, requests.exceptions.HTTPError):
-            status_code = error.response.status_code if error.response else None
+            status_code = _http_status(error)
 
             # 5xx: Server errors (temporários)
             if status_code and 500 <= status_code < 600:
@@ -119,10 +162,12 @@ class RetryHandler:
             Delay em segundos
         """
         # Para 429 (Too Many Requests), usar delay muito maior
-        import requests
-        if (isinstance(error, requests.exceptions.HTTPError) and
-            hasattr(error, 'response') and error.response and
-            error.response.status_code == 429):
+        if _http_status(error) == 429:
+
+            # O servidor informou a espera exata: evita dormir demais ou de menos
+            retry_after = parse_retry_after(error.response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after + random.uniform(0, 1.0), 120.0)
 
             base_delay_429 = 30.0
             delay = base_delay_429 * attempt
@@ -156,14 +201,16 @@ class RetryHandler:
 
         for attempt in range(1, self.config.max_attempts + 1):
             try:
-                self.logger.debug(
-                    f"Executando tentativa {attempt}/{self.config.max_attempts}",
-                    extra={
-                        "attempt": attempt,
-                        "max_attempts": self.config.max_attempts,
-                        "function": func.__name__
-                    }
-                )
+                # Guarda evita formatar a mensagem/extra a cada tentativa com DEBUG desligado
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(
+                        f"Executando tentativa {attempt}/{self.config.max_attempts}",
+                        extra={
+                            "attempt": attempt,
+                            "max_attempts": self.config.max_attempts,
+                            "function": func.__name__
+                        }
+                    )
 
                 result = func(*args, **kwargs)
 
@@ -202,12 +249,7 @@ class RetryHandler:
                 delay = self._calculate_delay_for_error(attempt, error)
 
                 # Log especial para 429s
-                import requests
-                is_429 = (isinstance(error, requests.exceptions.HTTPError) and
-                         hasattr(error, 'response') and error.response and
-                         error.response.status_code == 429)
-
-                if is_429:
+                if _http_status(error) == 429:
                     self.logger.warning(
                         f"HTTP 429 (Too Many Requests) - aguardando {delay:.0f}s antes da próxima tentativa",
                         extra={
@@ -13,9 +13,16 @@ import time
 import requests
 import pandas as pd
 from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse
 from core.logger import setup_logger
+from core import json_utils
+from core.http_pool import get_session
+from core.file_cache import FileCache, DAILY_TTL, INTRADAY_TTL
 
 
+# Sent with every request instead of being set on the (shared) session
+_HEADERS = {'Accept-Encoding': 'gzip', 'Connection': 'keep-alive'}
+
 class TwelveDataClient:
     """Simple client for Twelve Data API.
 
@@ -26,9 +33,21 @@ class TwelveDataClient:
 
     BASE_URL = "https://api.twelvedata.com"
 
-    def __init__(self, api_key: Optional[str] = None):
+    # Symbols per /time_series request (free tier: 8 credits per request)
+    BATCH_SIZE = 8
+
+    _PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+
+    # Intervals whose bars don't change intraday (cached for a day)
+    _DAILY_INTERVALS = frozenset({'1day', '1week', '1month'})
+
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[FileCache] = None,
+                 session: Optional[requests.Session] = None):
         self.api_key = api_key or os.environ.get('TWELVEDATA_API_KEY')
-        self.session = requests.Session()
+        # Shared keep-alive pool (see core.http_pool) unless a session is injected.
+        # The session may be shared, so headers go per request (gzip shrinks large JSON)
+        self.session = session or get_session(urlparse(self.BASE_URL).netloc)
+        self.cache = cache or FileCache(namespace='twelvedata')
         self.logger = setup_logger('scraper.twelvedata_client')
 
         if not self.api_key:
@@ -41,12 +60,13 @@ class TwelveDataClient:
         params['apikey'] = self.api_key
         url = f"{self.BASE_URL}{path}"
 
-        start = time.time()
-        r = self.session.get(url, params=params, timeout=30)
-        elapsed = time.time() - start
+        start = time.monotonic()
+        r = self.session.get(url, params=params, headers=_HEADERS, timeout=30)
+        elapsed = time.monotonic() - start
 
         try:
-            data = r.json()
+            # orjson when available (JSONDecodeError subclasses ValueError)
+            data = json_utils.loads(r.content)
         except ValueError:
             self.logger.error('Invalid JSON from Twelve Data', extra={'url': url, 'status': r.status_code})
             raise
@@ -58,6 +78,36 @@ class TwelveDataClient:
         self.logger.info('Twelve Data request successful', extra={'path': path, 'elapsed': round(elapsed, 2)})
         return data
 
+    def _cache_key(self, symbol: str, interval: str, outputsize: int) -> str:
+        return FileCache.make_key('twelvedata', symbol, interval, outputsize)
+
+    def _cache_ttl(self, interval: str) -> int:
+        return DAILY_TTL if interval in self._DAILY_INTERVALS else INTRADAY_TTL
+
+    def _values_to_df(self, values: Optional[List[Dict[str, Any]]]) -> Optional[pd.DataFrame]:
+        """Convert a Twelve Data `values` array into the Yahoo-like DataFrame (None if empty)."""
+        if not values:
+            return None
+
+        # Twelve Data returns strings; convert all price columns with one astype
+        df = pd.DataFrame(values)
+        price_types = {c: 'float64' for c in self._PRICE_COLUMNS if c in df.columns}
+        try:
+            df = df.astype(price_types)
+        except (TypeError, ValueError):
+            # Unparseable values: coerce them to NaN instead
+            num_cols = list(price_types)
+            df[num_cols] = df[num_cols].apply(pd.to_numeric, errors='coerce').astype('float64')
+        if 'volume' in df.columns:
+            df['volume'] = pd.to_numeric(df['volume'], errors='coerce').fillna(0).astype('Int64')
+
+        df['datetime'] = pd.to_datetime(df['datetime'], cache=True)
+        df['date'] = df['datetime'].dt.strftime('%Y-%m-%d')
+
+        # Reorder
+        column_order = ['datetime', 'date', 'open', 'high', 'low', 'close', 'volume']
+        return df[[c for c in column_order if c in df.columns]]
+
     def get_time_series(self, symbol: str, interval: str = '1day', outputsize: int = 5000) -> Optional[pd.DataFrame]:
         """Get historical time series for a single symbol.
 
@@ -66,6 +116,11 @@ class TwelveDataClient:
         if not self.api_key:
             return None
 
+        cache_key = self._cache_key(symbol, interval, outputsize)
+        cached = self.cache.get(cache_key, ttl=self._cache_ttl(interval))
+        if cached is not None:
+            return cached
+
         params = {
             'symbol': symbol,
             'interval': interval,
@@ -75,35 +130,9 @@ class TwelveDataClient:
 
         try:
             data = self._request('/time_series', params)
-            values = data.get('values') or []
-
-            if not values:
-                return None
-
-            df = pd.DataFrame(values)
-            # Twelve Data returns strings; convert types
-            df = df.rename(columns={
-                'datetime': 'datetime',
-                'open': 'open',
-                'high': 'high',
-                'low': 'low',
-                'close': 'close',
-                'volume': 'volume'
-            })
-
-            # Convert types
-            for col in ['open', 'high', 'low', 'close']:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-            if 'volume' in df.columns:
-                df['volume'] = pd.to_numeric(df['volume'], errors='coerce').fillna(0).astype('Int64')
-
-            df['datetime'] = pd.to_datetime(df['datetime'])
-            df['date'] = df['datetime'].dt.strftime('%Y-%m-%d')
-
-            # Reorder
-            column_order = ['datetime', 'date', 'open', 'high', 'low', 'close', 'volume']
-            df = df[[c for c in column_order if c in df.columns]]
+            df = self._values_to_df(data.get('values'))
+            if df is not None:
+                self.cache.set(cache_key, df)
             return df
 
         except Exception:
@@ -111,18 +140,54 @@ class TwelveDataClient:
             return None
 
     def download_multiple(self, symbols: List[str], interval: str = '1day', outputsize: int = 5000) -> Dict[str, pd.DataFrame]:
-        """Download multiple symbols sequentially (Twelve Data doesn't support large batch endpoints on free tier).
+        """Download multiple symbols, BATCH_SIZE per request.
 
-        This implementation is intentionally simple: it iterates symbols and calls get_time_series.
+        /time_series accepts comma-separated symbols and answers with a dict keyed
+        by symbol, so N symbols cost ceil(N / BATCH_SIZE) round-trips. Cached
+        symbols are served without HTTP.
         """
         results: Dict[str, pd.DataFrame] = {}
+        if not self.api_key:
+            return results
+
+        pending = []
         for s in symbols:
+            cached = self.cache.get(self._cache_key(s, interval, outputsize), ttl=self._cache_ttl(interval))
+            if cached is not None:
+                results[s] = cached
+            else:
+                pending.append(s)
+
+        for i in range(0, len(pending), self.BATCH_SIZE):
+            chunk = pending[i:i + self.BATCH_SIZE]
+            params = {
+                'symbol': ','.join(chunk),
+                'interval': interval,
+                'outputsize': outputsize,
+                'format': 'JSON'
+            }
+
             try:
-                df = self.get_time_series(s, interval=interval, outputsize=outputsize)
+                data = self._request('/time_series', params)
+            except Exception:
+                self.logger.exception('Error downloading symbols %s from Twelve Data', ','.join(chunk))
+                continue
+
+            # A single symbol comes back unwrapped
+            payloads = {chunk[0]: data} if len(chunk) == 1 else data
+            for s in chunk:
+                payload = payloads.get(s) or {}
+                if payload.get('status') == 'error':
+                    self.logger.warning('Twelve Data returned error for %s', s, extra={'body': payload})
+                    continue
+                try:
+                    df = self._values_to_df(payload.get('values'))
+                except Exception:
+                    self.logger.exception('Failed to parse Twelve Data series for %s', s)
+                    continue
                 if df is not None:
                     results[s] = df
-            except Exception:
-                self.logger.exception('Error downloading symbol %s from Twelve Data', s)
+                    self.cache.set(self._cache_key(s, interval, outputsize), df)
         return results
 
 
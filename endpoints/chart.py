@@ -7,17 +7,248 @@ Migrado do Yahoo Finance para Alpha Vantage para maior confiabilidade.
 Mantém exatamente a mesma interface externa.
 """
 
+import functools
+import io
+import logging
 import pandas as pd
 import numpy as np
+import requests
 from typing import Dict, List, Optional, Union, Tuple
 from datetime import datetime, timedelta
 import time
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from core.alphavantage_client import AlphaVantageClient, default_alphavantage_client
+from core.alphavantage_client import AlphaVantageClient, get_default_alphavantage_client
+from core.file_cache import FileCache, DAILY_TTL, INTRADAY_TTL
 from core.logger import setup_logger
+from core.rate_limiter import RateLimiter
 from utils.validation import FinancialDataValidator, ValidationResult, Severity
 
 
+# Colunas do CSV da Alpha Vantage (datatype=csv)
+_CSV_PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'adjusted_close', 'adjusted close')
+_CSV_COLUMN_NAMES = {
+    'timestamp': 'datetime',
+    'adjusted_close': 'adj_close',
+    'adjusted close': 'adj_close'
+}
+
+# Colunas de preço do DataFrame final
+_PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'adj_close')
+
+
+def _parse_time_series(
+    time_series_data: Dict,
+    symbol: str,
+    price_dtype: Union[str, np.dtype] = np.float32
+) -> pd.DataFrame:
+    """
+    Converte a série temporal da Alpha Vantage em DataFrame estruturado.
+
+    Args:
+        time_series_data: Série temporal {data: {campo: valor}}
+        symbol: Símbolo da ação
+        price_dtype: Dtype das colunas de preço
+
+    Returns:
+        DataFrame com dados de preços (mesma estrutura do Yahoo Finance)
+    """
+    logger = setup_logger("scraper.endpoints.chart")
+
+    # Alpha Vantage usa diferentes formatos de chave dependendo do endpoint:
+    # o esquema é detectado uma vez, no primeiro registro, e vale para a série toda
+    first = next(iter(time_series_data.values()), None) or {}
+
+    if '1. open' in first:  # Formato daily/weekly/monthly
+        k_open, k_high, k_low, k_close = '1. open', '2. high', '3. low', '4. close'
+        if '5. adjusted close' in first:  # Endpoints *_ADJUSTED
+            k_adj, k_vol = '5. adjusted close', '6. volume'
+        else:  # Fallback para close se não tiver adjusted
+            k_adj, k_vol = '4. close', '5. volume'
+    elif 'open' in first:  # Formato alternativo
+        k_open, k_high, k_low, k_close = 'open', 'high', 'low', 'close'
+        k_adj = 'adjusted close' if 'adjusted close' in first else 'close'
+        k_vol = 'volume'
+    else:
+        # Log das chaves disponíveis para debug
+        logger.warning(
+            f"Formato inesperado de dados Alpha Vantage",
+            extra={
+                "symbol": symbol,
+                "available_keys": list(first.keys())
+            }
+        )
+        raise ValueError(f"Nenhum registro válido encontrado para {symbol}")
+
+    # Colunas montadas em listas paralelas (sem um dict por linha)
+    dates = list(time_series_data)
+    row_getter = itemgetter(k_open, k_high, k_low, k_close, k_vol, k_adj)
+
+    try:
+        # Caminho rápido: extração e transposição em C (map + itemgetter + zip),
+        # sem laço Python por linha
+        rows = map(row_getter, time_series_data.values())
+        opens, highs, lows, closes, vols, adjs = map(list, zip(*rows))
+    except KeyError:
+        # Algum registro sem o campo esperado: laço linha a linha, descartando os incompletos
+        dates, opens, highs, lows, closes, vols, adjs = [], [], [], [], [], [], []
+
+        for date_str, bar in time_series_data.items():
+            try:
+                row = row_getter(bar)
+            except KeyError:
+                logger.warning(
+                    f"Formato inesperado de dados Alpha Vantage",
+                    extra={
+                        "symbol": symbol,
+                        "date": date_str,
+                        "available_keys": list(bar.keys())
+                    }
+                )
+                continue
+
+            dates.append(date_str)
+            opens.append(row[0])
+            highs.append(row[1])
+            lows.append(row[2])
+            closes.append(row[3])
+            vols.append(row[4])
+            adjs.append(row[5])
+
+    if not dates:
+        raise ValueError(f"Nenhum registro válido encontrado para {symbol}")
+
+    # Alpha Vantage vem em ordem reversa: inverter as listas (O(N)) em vez de ordenar o frame
+    # (datas ISO comparam corretamente como string)
+    if dates[0] > dates[-1]:
+        for column in (dates, opens, highs, lows, closes, vols, adjs):
+            column.reverse()
+
+    # Criar DataFrame a partir de arrays tipados (conversão de strings feita pelo NumPy)
+    # Datas no formato fixo YYYY-MM-DD: parse pelo caminho rápido em C, sem inferência
+    df = pd.DataFrame({
+        'datetime': pd.to_datetime(dates, format='%Y-%m-%d', cache=True),
+        'open': np.asarray(opens, dtype=price_dtype),
+        'high': np.asarray(highs, dtype=price_dtype),
+        'low': np.asarray(lows, dtype=price_dtype),
+        'close': np.asarray(closes, dtype=price_dtype),
+        # Volume passa por float64: a API pode enviar '123.0'
+        'volume': np.asarray(vols, dtype=np.float64).astype(np.int64),
+        'adj_close': np.asarray(adjs, dtype=price_dtype)
+    }, copy=False)  # Arrays recém-criados e exclusivos: o frame os usa sem copiar
+
+    return _finish_frame(df, symbol)
+
+
+def _finish_frame(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    """
+    Completa o DataFrame de preços (datetime/OHLC/adj_close/volume) com os
+    metadados, a ordem de colunas do Yahoo Finance e a limpeza final.
+    """
+    # Data como datetime64 à meia-noite (buffer contíguo de 8 bytes/linha), em vez
+    # de uma coluna object com um datetime.date Python por linha
+    df['date'] = df['datetime'].dt.normalize()
+
+    # Metadados constantes por série: categóricos com um único código int8 por linha
+    single_code = np.zeros(len(df), dtype=np.int8)
+    df['symbol'] = pd.Categorical.from_codes(single_code, categories=[symbol])
+    # Alpha Vantage padrão para TIME_SERIES_DAILY
+    df['currency'] = pd.Categorical.from_codes(single_code, categories=['USD'])
+    # Extrair exchange do símbolo se disponível (ex: ASML.AS = Amsterdam)
+    df['exchange'] = pd.Categorical.from_codes(single_code, categories=[ChartDataCollector._exchange_for_symbol(symbol)])
+
+    # Reordenar colunas para mesma estrutura do Yahoo Finance
+    column_order = [
+        'datetime', 'date', 'symbol', 'open', 'high',
+        'low', 'close', 'adj_close', 'volume', 'currency', 'exchange'
+    ]
+    df = df[column_order]
+
+    # Remover linhas com dados nulos (só possível com 'nan' literal na API:
+    # a checagem em NumPy evita a máscara e a cópia no caso comum)
+    ohlc = ['open', 'high', 'low', 'close']
+    if np.isnan(df[ohlc].to_numpy()).any():
+        df = df.dropna(subset=ohlc).reset_index(drop=True)
+
+    # Garantia para payloads fora de ordem (checagem O(N); normalmente já está ordenado)
+    if not df['datetime'].is_monotonic_increasing:
+        df = df.sort_values('datetime', kind='mergesort').reset_index(drop=True)
+
+    return df
+
+
+def _parse_csv_series(
+    body: bytes,
+    symbol: str,
+    price_dtype: Union[str, np.dtype] = np.float32
+) -> pd.DataFrame:
+    """
+    Converte a série em CSV da Alpha Vantage (datatype=csv) em DataFrame.
+
+    O pd.read_csv faz parse e conversão de tipos em uma única passada em C,
+    sem JSON intermediário.
+
+    Args:
+        body: Corpo CSV bruto da resposta
+        symbol: Símbolo da ação
+        price_dtype: Dtype das colunas de preço
+
+    Returns:
+        DataFrame com dados de preços (mesma estrutura de _parse_time_series)
+    """
+    dtypes = {column: price_dtype for column in _CSV_PRICE_COLUMNS}
+    # Volume passa por float64: a API pode enviar '123.0'
+    dtypes['volume'] = np.float64
+
+    df = pd.read_csv(io.BytesIO(body), dtype=dtypes)
+    df.columns = [_CSV_COLUMN_NAMES.get(column, column) for column in df.columns]
+
+    if len(df) == 0 or 'datetime' not in df.columns:
+        raise ValueError(f"Nenhum registro válido encontrado para {symbol}")
+
+    # Alpha Vantage vem em ordem reversa: inverter (O(N)) em vez de ordenar o frame
+    if df['datetime'].iat[0] > df['datetime'].iat[-1]:
+        df = df.iloc[::-1].reset_index(drop=True)
+
+    df['datetime'] = pd.to_datetime(df['datetime'], format='%Y-%m-%d', cache=True)
+    df['volume'] = df['volume'].to_numpy().astype(np.int64)
+    if 'adj_close' not in df.columns:  # Fallback para close se não tiver adjusted
+        df['adj_close'] = df['close']
+
+    return _finish_frame(df, symbol)
+
+
+def _to_arrow_dtypes(df: pd.DataFrame, price_dtype: np.dtype) -> pd.DataFrame:
+    """
+    Converte preços e volume para dtypes PyArrow (ex: float32[pyarrow], int64[pyarrow]).
+
+    Buffers Arrow contíguos, com nulos em bitmap em vez de upcast para float64,
+    e troca zero-copy com engines baseadas em Arrow (Polars, DuckDB).
+    """
+    price_arrow = f"{np.dtype(price_dtype).name}[pyarrow]"
+    dtypes = {column: price_arrow for column in _PRICE_COLUMNS}
+    dtypes['volume'] = 'int64[pyarrow]'
+    return df.astype(dtypes)
+
+
+def _parse_raw(
+    raw: Union[Dict, bytes],
+    symbol: str,
+    price_dtype: Union[str, np.dtype] = np.float32
+) -> pd.DataFrame:
+    """Converte a resposta bruta (série JSON já decodificada ou CSV) em DataFrame"""
+    if isinstance(raw, bytes):
+        return _parse_csv_series(raw, symbol, price_dtype)
+    return _parse_time_series(raw, symbol, price_dtype)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_validator() -> FinancialDataValidator:
+    """Validador compartilhado entre coletores (validate() não altera o estado da instância)"""
+    return FinancialDataValidator(auto_correct=True)
+
+
 class ChartDataCollector:
     """
     Coletor especializado em dados de charts/preços usando Alpha Vantage.
@@ -44,16 +275,90 @@ class ChartDataCollector:
         'max': 'Máximo disponível (20+ anos)'
     }
 
-    def __init__(self, client: AlphaVantageClient = None):
+    # Chaves válidas e listas para mensagens de erro, montadas uma única vez
+    _VALID_INTERVAL_KEYS = frozenset(VALID_INTERVALS)
+    _VALID_PERIOD_KEYS = frozenset(VALID_PERIODS)
+    _VALID_INTERVALS_TEXT = ', '.join(VALID_INTERVALS)
+    _VALID_PERIODS_TEXT = ', '.join(VALID_PERIODS)
+
+    # Chave da série na resposta por intervalo (versão ajustada primeiro)
+    _TS_KEYS_BY_INTERVAL = {
+        '1d': ('Time Series (Daily)',),
+        '1wk': ('Weekly Adjusted Time Series', 'Weekly Time Series'),
+        '1mo': ('Monthly Adjusted Time Series', 'Monthly Time Series')
+    }
+
+    # Janela em dias corridos de cada período ('max' não é recortado)
+    _PERIOD_DAYS = {
+        '5d': 5,
+        '1mo': 31,
+        '3mo': 93,
+        '6mo': 186,
+        '1y': 372,
+        '2y': 744,
+        '5y': 1860
+    }
+
+    # Períodos atendidos pelo outputsize compact (últimos 100 pontos)
+    _COMPACT_PERIODS = frozenset({'5d', '1mo', '3mo'})
+
+    # Mínimo de barras mantidas no recorte (mesmo mínimo do validador)
+    _MIN_PERIOD_ROWS = 5
+
+    # Sufixo do símbolo -> bolsa
+    EXCHANGE_MAP = {
+        'AS': 'Amsterdam',
+        'L': 'London',
+        'DE': 'Frankfurt',
+        'PA': 'Paris',
+        'MI': 'Milan'
+    }
+
+    def __init__(
+        self,
+        client: AlphaVantageClient = None,
+        session: Optional[requests.Session] = None,
+        price_dtype: str = 'float32',
+        datatype: str = 'json',
+        cache: FileCache = None,
+        dtype_backend: str = 'numpy',
+        quality_checks: bool = True
+    ):
         """
         Inicializa o coletor de dados de chart.
 
         Args:
             client: Cliente Alpha Vantage personalizado (usa padrão se None)
+            session: Sessão HTTP para um cliente dedicado (ignorada se `client` for passado).
+                Permite plugar uma sessão com cache HTTP em disco, por exemplo
+                requests_cache.CachedSession('av_cache', backend='sqlite', expire_after=3600),
+                para que respostas repetidas não consumam a quota da Alpha Vantage.
+            price_dtype: Dtype das colunas de preço ('float32' basta para forecasting e usa
+                metade da memória; passe 'float64' para precisão total)
+            datatype: Formato das séries na Alpha Vantage ('json' ou 'csv'; o CSV é
+                ~3x menor e vai direto para pd.read_csv)
+            cache: Cache em disco dos DataFrames já convertidos (usa padrão se None)
+            dtype_backend: 'numpy' (padrão) ou 'pyarrow' para entregar preços e volume
+                em colunas Arrow (float32[pyarrow]/int64[pyarrow])
+            quality_checks: Se False, a validação roda só as checagens que podem
+                rejeitar os dados (pula gaps, fins de semana, variações extremas e
+                outliers, que só geram avisos)
         """
-        self.client = client or default_alphavantage_client
+        if datatype not in ('json', 'csv'):
+            raise ValueError(f"datatype '{datatype}' inválido. Válidos: json, csv")
+        if dtype_backend not in ('numpy', 'pyarrow'):
+            raise ValueError(f"dtype_backend '{dtype_backend}' inválido. Válidos: numpy, pyarrow")
+
+        if client is None and session is not None:
+            client = AlphaVantageClient(session=session)
+        self.client = client or get_default_alphavantage_client()
+        self.price_dtype = np.dtype(price_dtype)
+        self.datatype = datatype
+        self.dtype_backend = dtype_backend
+        self.quality_checks = quality_checks
+        self.cache = cache or FileCache(namespace='chart')
         self.logger = setup_logger("scraper.endpoints.chart")
-        self.validator = FinancialDataValidator(auto_correct=True)
+        self.validator = _get_validator()
 
         self.logger.info(
             "Chart data collector inicializado (Alpha Vantage)",
@@ -81,13 +386,11 @@ class ChartDataCollector:
         if not symbol or not isinstance(symbol, str):
             raise ValueError("Símbolo deve ser uma string não vazia")
 
-        if interval not in self.VALID_INTERVALS:
-            valid_intervals = ', '.join(self.VALID_INTERVALS.keys())
-            raise ValueError(f"Intervalo '{interval}' inválido. Válidos: {valid_intervals}")
+        if interval not in self._VALID_INTERVAL_KEYS:
+            raise ValueError(f"Intervalo '{interval}' inválido. Válidos: {self._VALID_INTERVALS_TEXT}")
 
-        if period not in self.VALID_PERIODS:
-            valid_periods = ', '.join(self.VALID_PERIODS.keys())
-            raise ValueError(f"Período '{period}' inválido. Válidos: {valid_periods}")
+        if period not in self._VALID_PERIOD_KEYS:
+            raise ValueError(f"Período '{period}' inválido. Válidos: {self._VALID_PERIODS_TEXT}")
 
     def _determine_outputsize(self, period: str) -> str:
         """
@@ -101,13 +404,33 @@ class ChartDataCollector:
         """
         # Alpha Vantage compact = últimos 100 pontos de dados
         # Alpha Vantage full = até 20+ anos de dados
+        # (semanal/mensal ignoram outputsize; o excesso é recortado em _trim_to_period)
+        return 'compact' if period in self._COMPACT_PERIODS else 'full'
 
-        if period in ['5d', '1mo', '3mo']:
-            return 'compact'  # 100 pontos são suficientes
-        else:
-            return 'full'     # Precisamos de mais dados históricos
+    def _trim_to_period(self, df: pd.DataFrame, period: str) -> pd.DataFrame:
+        """
+        Recorta o DataFrame (ordenado por datetime) à janela do período.
 
-    def _fetch_raw_data(self, symbol: str, period: str, interval: str) -> Dict:
+        'full' traz até 20 anos mesmo quando o período pedido é 1y/2y; sem o
+        recorte o chamador recebia o histórico inteiro e a validação varria
+        todas as linhas.
+        """
+        days = self._PERIOD_DAYS.get(period)
+        if days is None or len(df) == 0:
+            return df
+
+        datetimes = df['datetime'].to_numpy()
+        cutoff = datetimes[-1] - np.timedelta64(days, 'D')
+        # Busca binária do início da janela, preservando o mínimo de barras
+        start = min(
+            int(np.searchsorted(datetimes, cutoff, side='left')),
+            max(len(df) - self._MIN_PERIOD_ROWS, 0)
+        )
+        if start == 0:
+            return df
+        return df.iloc[start:].reset_index(drop=True)
+
+    def _fetch_raw_data(self, symbol: str, period: str, interval: str) -> Tuple[str, Dict, Dict]:
         """
         Busca dados brutos da Alpha Vantage.
 
@@ -117,7 +440,7 @@ class ChartDataCollector:
             interval: Intervalo dos dados
 
         Returns:
-            Dados brutos da Alpha Vantage
+            Tupla (chave da série temporal, série temporal, Meta Data)
 
         Raises:
             Exception: Se falhar na coleta ou dados inválidos
@@ -125,16 +448,17 @@ class ChartDataCollector:
         # Determinar outputsize baseado no período
         outputsize = self._determine_outputsize(period)
 
-        self.logger.debug(
-            f"Buscando dados Alpha Vantage para {symbol}",
-            extra={
-                "symbol": symbol,
-                "period": period,
-                "interval": interval,
-                "outputsize": outputsize,
-                "data_provider": "AlphaVantage"
-            }
-        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                f"Buscando dados Alpha Vantage para {symbol}",
+                extra={
+                    "symbol": symbol,
+                    "period": period,
+                    "interval": interval,
+                    "outputsize": outputsize,
+                    "data_provider": "AlphaVantage"
+                }
+            )
 
         # Usar o cliente Alpha Vantage para buscar dados
         data = self.client.get_data_for_interval(symbol, interval, outputsize)
@@ -143,129 +467,82 @@ class ChartDataCollector:
         if 'Error Message' in data:
             raise ValueError(f"Erro Alpha Vantage para {symbol}: {data['Error Message']}")
 
-        # Verificar se temos dados de série temporal
-        time_series_key = None
-        for key in data.keys():
-            if 'Time Series' in key:
-                time_series_key = key
-                break
+        # Verificar se temos dados de série temporal: lookup direto pela chave
+        # esperada do intervalo, varrendo as chaves só se o formato mudar
+        time_series_key = next((key for key in self._TS_KEYS_BY_INTERVAL.get(interval, ()) if key in data), None)
+        if time_series_key is None:
+            for key in data.keys():
+                if 'Time Series' in key:
+                    time_series_key = key
+                    break
 
         if not time_series_key or not data.get(time_series_key):
             available_keys = list(data.keys())
             raise ValueError(f"Nenhum dado de série temporal encontrado para {symbol}. Chaves disponíveis: {available_keys}")
 
-        return data
-
-    def _parse_to_dataframe(self, raw_data: Dict, symbol: str) -> pd.DataFrame:
-        """
-        Converte dados brutos da Alpha Vantage em DataFrame estruturado.
-
-        Args:
-            raw_data: Dados brutos da Alpha Vantage
-            symbol: Símbolo da ação
+        return time_series_key, data[time_series_key], data.get('Meta Data', {})
 
-        Returns:
-            DataFrame com dados de preços (mesma estrutura do Yahoo Finance)
-        """
-        # Encontrar a chave de série temporal
-        time_series_key = None
-        for key in raw_data.keys():
-            if 'Time Series' in key:
-                time_series_key = key
-                break
-
-        if not time_series_key:
-            raise ValueError(f"Chave de série temporal não encontrada para {symbol}")
-
-        time_series_data = raw_data[time_series_key]
-
-        # Extrair metadados se disponíveis
-        metadata = raw_data.get('Meta Data', {})
-
-        # Converter dados Alpha Vantage para formato DataFrame
-        records = []
-
-        for date_str, price_data in time_series_data.items():
-            # Alpha Vantage usa diferentes formatos de chave dependendo do endpoint
-            # Mapeamento para formato consistente
-
-            if '1. open' in price_data:  # Formato daily/weekly/monthly
-                record = {
-                    'date': date_str,
-                    'open': float(price_data.get('1. open', 0)),
-                    'high': float(price_data.get('2. high', 0)),
-                    'low': float(price_data.get('3. low', 0)),
-                    'close': float(price_data.get('4. close', 0)),
-                    'volume': int(float(price_data.get('5. volume', 0))),
-                    'adj_close': float(price_data.get('5. adjusted close', price_data.get('4. close', 0)))  # Fallback para close se não tiver adjusted
-                }
-            elif 'open' in price_data:  # Formato alternativo
-                record = {
-                    'date': date_str,
-                    'open': float(price_data.get('open', 0)),
-                    'high': float(price_data.get('high', 0)),
-                    'low': float(price_data.get('low', 0)),
-                    'close': float(price_data.get('close', 0)),
-                    'volume': int(float(price_data.get('volume', 0))),
-                    'adj_close': float(price_data.get('adjusted close', price_data.get('close', 0)))
-                }
-            else:
-                # Log das chaves disponíveis para debug
-                available_keys = list(price_data.keys())
-                self.logger.warning(
-                    f"Formato inesperado de dados Alpha Vantage",
-                    extra={
-                        "symbol": symbol,
-                        "date": date_str,
-                        "available_keys": available_keys
-                    }
-                )
-                continue
-
-            records.append(record)
+    def _frame_cache_key(self, symbol: str, period: str, interval: str) -> str:
+        """Chave do DataFrame convertido: depende do outputsize, não do período recortado"""
+        return FileCache.make_key('chart', symbol, interval, self._determine_outputsize(period), self.price_dtype.name)
 
-        if not records:
-            raise ValueError(f"Nenhum registro válido encontrado para {symbol}")
+    def _cached_frame(self, symbol: str, period: str, interval: str) -> Optional[pd.DataFrame]:
+        """DataFrame convertido em cache (None se ausente ou expirado)"""
+        # Mesma validade do cache do cliente: pulls 'compact' (5d/1mo/3mo) servem
+        # os pregões mais recentes e expiram em 1h; 'full' vale 24h
+        ttl = INTRADAY_TTL if self._determine_outputsize(period) == 'compact' else DAILY_TTL
+        return self.cache.get(self._frame_cache_key(symbol, period, interval), ttl=ttl)
 
-        # Criar DataFrame
-        df = pd.DataFrame(records)
-
-        # Converter date string para datetime
-        df['datetime'] = pd.to_datetime(df['date'])
-        df['date'] = df['datetime'].dt.date
-
-        # Adicionar metadados
-        df['symbol'] = symbol
-        df['currency'] = 'USD'  # Alpha Vantage padrão para TIME_SERIES_DAILY
+    def _fetch_raw(self, symbol: str, period: str, interval: str) -> Union[Dict, bytes]:
+        """Busca a série bruta no formato configurado (dict da série JSON ou corpo CSV)"""
+        if self.datatype == 'csv':
+            return self.client.get_data_for_interval(
+                symbol, interval, self._determine_outputsize(period), datatype='csv'
+            )
+        return self._fetch_raw_data(symbol, period, interval)[1]
 
-        # Extrair exchange do símbolo se disponível (ex: ASML.AS = Amsterdam)
+    @classmethod
+    def _exchange_for_symbol(cls, symbol: str) -> str:
+        """Bolsa a partir do sufixo do símbolo (ex: ASML.AS = Amsterdam)"""
         if '.' in symbol:
             exchange_code = symbol.split('.')[1]
-            exchange_map = {
-                'AS': 'Amsterdam',
-                'L': 'London',
-                'DE': 'Frankfurt',
-                'PA': 'Paris',
-                'MI': 'Milan'
-            }
-            df['exchange'] = exchange_map.get(exchange_code, exchange_code)
-        else:
-            df['exchange'] = 'US'  # Símbolos sem sufixo são geralmente US
+            return cls.EXCHANGE_MAP.get(exchange_code, exchange_code)
+        return 'US'  # Símbolos sem sufixo são geralmente US
 
-        # Reordenar colunas para mesma estrutura do Yahoo Finance
-        column_order = [
-            'datetime', 'date', 'symbol', 'open', 'high',
-            'low', 'close', 'adj_close', 'volume', 'currency', 'exchange'
-        ]
-        df = df[column_order]
+    def _fetch_global_quote(self, symbol: str) -> Dict[str, Union[float, str]]:
+        """
+        Busca o preço atual via GLOBAL_QUOTE (um único dict, sem montar DataFrame).
 
-        # Remover linhas com dados nulos
-        df = df.dropna(subset=['open', 'high', 'low', 'close'])
+        Raises:
+            ValueError: Se a resposta não trouxer uma cotação válida
+        """
+        quote = self.client.get_quote(symbol).get('Global Quote') or {}
+        if not quote.get('05. price'):
+            raise ValueError(f"Cotação vazia da Alpha Vantage para {symbol}")
+
+        price = float(quote['05. price'])
+        return {
+            'symbol': symbol,
+            'price': price,
+            'adj_price': price,  # GLOBAL_QUOTE não traz preço ajustado
+            'volume': int(float(quote.get('06. volume') or 0)),
+            'date': quote['07. latest trading day'],
+            'currency': 'USD',  # Alpha Vantage padrão, igual a _parse_to_dataframe
+            'exchange': self._exchange_for_symbol(symbol)
+        }
+
+    def _parse_to_dataframe(self, time_series_data: Dict, symbol: str) -> pd.DataFrame:
+        """
+        Converte a série temporal da Alpha Vantage em DataFrame estruturado.
 
-        # Ordenar por data (Alpha Vantage vem em ordem reversa)
-        df = df.sort_values('datetime').reset_index(drop=True)
+        Args:
+            time_series_data: Série temporal {data: {campo: valor}} (já extraída em _fetch_raw_data)
+            symbol: Símbolo da ação
 
-        return df
+        Returns:
+            DataFrame com dados de preços (mesma estrutura do Yahoo Finance)
+        """
+        return _parse_time_series(time_series_data, symbol, self.price_dtype)
 
     def get_historical_data(
         self,
@@ -295,28 +572,63 @@ class ChartDataCollector:
 
         start_time = time.time()
 
-        self.logger.info(
-            f"Iniciando coleta de dados históricos",
-            extra={
-                "symbol": symbol,
-                "period": period,
-                "interval": interval,
-                "validate_data": validate
-            }
-        )
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                f"Iniciando coleta de dados históricos",
+                extra={
+                    "symbol": symbol,
+                    "period": period,
+                    "interval": interval,
+                    "validate_data": validate
+                }
+            )
 
         try:
-            # Buscar dados brutos
-            raw_data = self._fetch_raw_data(symbol, period, interval)
+            # DataFrame já convertido em cache: pula requisição e parse
+            df = self._cached_frame(symbol, period, interval)
+
+            if df is None:
+                # Buscar dados brutos e converter para DataFrame
+                if self.datatype == 'csv':
+                    df = _parse_csv_series(self._fetch_raw(symbol, period, interval), symbol, self.price_dtype)
+                else:
+                    _, time_series_data, _ = self._fetch_raw_data(symbol, period, interval)
+                    df = self._parse_to_dataframe(time_series_data, symbol)
+                self.cache.set(self._frame_cache_key(symbol, period, interval), df)
+
+            return self._finalize(df, symbol, period, interval, validate, start_time)
+
+        except Exception as e:
+            self.logger.error(
+                f"Falha na coleta de dados históricos",
+                extra={
+                    "symbol": symbol,
+                    "period": period,
+                    "interval": interval,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                }
+            )
+            raise
 
-            # Converter para DataFrame
-            df = self._parse_to_dataframe(raw_data, symbol)
+    def _finalize(
+        self,
+        df: pd.DataFrame,
+        symbol: str,
+        period: str,
+        interval: str,
+        validate: bool,
+        start_time: float
+    ) -> pd.DataFrame:
+        """Recorta ao período, valida o DataFrame (se solicitado) e registra a coleta"""
+        df = self._trim_to_period(df, period)
 
-            # Validar dados se solicitado
-            if validate:
-                validation_result = self.validator.validate(df, symbol)
+        # Validar dados se solicitado
+        if validate:
+            validation_result = self.validator.validate(df, symbol, quality_checks=self.quality_checks)
 
-                # Log detalhado dos resultados da validação
+            # Log detalhado dos resultados da validação
+            if self.logger.isEnabledFor(logging.INFO):
                 self.logger.info(
                     f"Validação de dados concluída para {symbol}",
                     extra={
@@ -329,22 +641,23 @@ class ChartDataCollector:
                     }
                 )
 
-                # Rejeitar se há issues críticas
-                if not validation_result.is_valid:
-                    critical_descriptions = [issue.description for issue in validation_result.critical_issues]
-                    self.logger.error(
-                        f"Dados rejeitados para {symbol} - issues críticas encontradas",
-                        extra={
-                            "symbol": symbol,
-                            "critical_issues": critical_descriptions,
-                            "total_records": len(df)
-                        }
-                    )
-                    raise ValueError(f"Dados inválidos para {symbol}: {'; '.join(critical_descriptions)}")
+            # Rejeitar se há issues críticas
+            if not validation_result.is_valid:
+                critical_descriptions = [issue.description for issue in validation_result.critical_issues]
+                self.logger.error(
+                    f"Dados rejeitados para {symbol} - issues críticas encontradas",
+                    extra={
+                        "symbol": symbol,
+                        "critical_issues": critical_descriptions,
+                        "total_records": len(df)
+                    }
+                )
+                raise ValueError(f"Dados inválidos para {symbol}: {'; '.join(critical_descriptions)}")
 
-                # Usar dados corrigidos se disponíveis
-                if validation_result.corrected_data is not None:
-                    df = validation_result.corrected_data
+            # Usar dados corrigidos se disponíveis
+            if validation_result.corrected_data is not None:
+                df = validation_result.corrected_data
+                if self.logger.isEnabledFor(logging.INFO):
                     self.logger.info(
                         f"Usando dados corrigidos para {symbol}",
                         extra={
@@ -354,15 +667,20 @@ class ChartDataCollector:
                         }
                     )
 
-                # Log warnings para monitoramento
-                for warning_issue in validation_result.warning_issues:
-                    self.logger.warning(
-                        f"Issue de qualidade detectada: {warning_issue.description}",
-                        extra=warning_issue.to_dict()
-                    )
+            # Log warnings para monitoramento
+            for warning_issue in validation_result.warning_issues:
+                self.logger.warning(
+                    f"Issue de qualidade detectada: {warning_issue.description}",
+                    extra=warning_issue.to_dict()
+                )
+
+        # Conversão para Arrow só no fim: parse e validação trabalham sobre arrays NumPy
+        if self.dtype_backend == 'pyarrow':
+            df = _to_arrow_dtypes(df, self.price_dtype)
 
-            collection_time = time.time() - start_time
+        collection_time = time.time() - start_time
 
+        if self.logger.isEnabledFor(logging.INFO):
             self.logger.info(
                 f"Dados históricos coletados com sucesso",
                 extra={
@@ -370,26 +688,35 @@ class ChartDataCollector:
                     "period": period,
                     "interval": interval,
                     "records_collected": len(df),
-                    "date_range": f"{df['datetime'].min()} to {df['datetime'].max()}" if 'datetime' in df.columns else "unknown",
+                    # Frame já ordenado: extremos por posição, sem varrer a coluna
+                    "date_range": f"{df['datetime'].iloc[0]} to {df['datetime'].iloc[-1]}" if 'datetime' in df.columns else "unknown",
                     "collection_time_seconds": round(collection_time, 2),
                     "data_quality": "validated" if validate else "not_validated"
                 }
             )
 
-            return df
+        return df
 
-        except Exception as e:
-            self.logger.error(
-                f"Falha na coleta de dados históricos",
-                extra={
-                    "symbol": symbol,
-                    "period": period,
-                    "interval": interval,
-                    "error_type": type(e).__name__,
-                    "error_message": str(e)
-                }
-            )
-            raise
+    def _latest_from_history(self, symbol: str) -> Dict[str, Union[float, str]]:
+        """Preço mais recente a partir da série diária (fallback de get_latest_price)"""
+        # Buscar dados dos últimos 5 dias para garantir dados recentes
+        df = self.get_historical_data(symbol, period="5d", interval="1d", validate=False)
+
+        if len(df) == 0:
+            raise ValueError(f"Nenhum dado encontrado para {symbol}")
+
+        # Pegar o registro mais recente
+        latest = df.iloc[-1]
+
+        return {
+            'symbol': symbol,
+            'price': float(latest['close']),
+            'adj_price': float(latest['adj_close']),
+            'volume': int(latest['volume']) if not pd.isna(latest['volume']) else 0,
+            'date': latest['date'].date().isoformat(),
+            'currency': latest['currency'],
+            'exchange': latest['exchange']
+        }
 
     def get_latest_price(self, symbol: str) -> Dict[str, Union[float, str]]:
         """
@@ -402,24 +729,19 @@ class ChartDataCollector:
             Dict com preço atual e metadados
         """
         try:
-            # Buscar dados dos últimos 5 dias para garantir dados recentes
-            df = self.get_historical_data(symbol, period="5d", interval="1d", validate=False)
-
-            if len(df) == 0:
-                raise ValueError(f"Nenhum dado encontrado para {symbol}")
-
-            # Pegar o registro mais recente
-            latest = df.iloc[-1]
-
-            result = {
-                'symbol': symbol,
-                'price': float(latest['close']),
-                'adj_price': float(latest['adj_close']),
-                'volume': int(latest['volume']) if not pd.isna(latest['volume']) else 0,
-                'date': latest['date'].isoformat(),
-                'currency': latest['currency'],
-                'exchange': latest['exchange']
-            }
+            try:
+                # Caminho rápido: um único dict de cotação
+                result = self._fetch_global_quote(symbol)
+            except Exception as quote_error:
+                self.logger.warning(
+                    f"GLOBAL_QUOTE falhou - usando série histórica",
+                    extra={
+                        "symbol": symbol,
+                        "error_type": type(quote_error).__name__,
+                        "error_message": str(quote_error)
+                    }
+                )
+                result = self._latest_from_history(symbol)
 
             self.logger.info(
                 f"Preço atual coletado",
@@ -447,15 +769,24 @@ class ChartDataCollector:
         self,
         symbols: List[str],
         period: str = "5y",
-        interval: str = "1d"
+        interval: str = "1d",
+        max_workers: int = 4,
+        requests_per_minute: Optional[int] = None
     ) -> Dict[str, pd.DataFrame]:
         """
-        Coleta dados para múltiplos símbolos.
+        Coleta dados para múltiplos símbolos em paralelo.
+
+        As requisições são sobrepostas em até `max_workers` threads; o rate
+        limiter do cliente (compartilhado entre as threads) continua limitando
+        a vazão ao teto da Alpha Vantage. Com o JSON bruto em mãos, a conversão
+        para DataFrame roda no processo atual (ver _parse_many).
 
         Args:
             symbols: Lista de símbolos
             period: Período dos dados
             interval: Intervalo dos dados
+            max_workers: Máximo de coletas simultâneas
+            requests_per_minute: Limite adicional para este lote (opcional)
 
         Returns:
             Dict {symbol: DataFrame}
@@ -469,27 +800,66 @@ class ChartDataCollector:
                 "symbols_count": len(symbols),
                 "symbols": symbols,
                 "period": period,
-                "interval": interval
+                "interval": interval,
+                "max_workers": max_workers
             }
         )
 
-        for i, symbol in enumerate(symbols, 1):
-            try:
-                self.logger.debug(f"Coletando {symbol} ({i}/{len(symbols)})")
+        batch_limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+        start_time = time.time()
 
-                df = self.get_historical_data(symbol, period, interval)
-                results[symbol] = df
+        def _fetch(symbol: str) -> Union[Dict, bytes, pd.DataFrame]:
+            self._validate_parameters(symbol, period, interval)
+            cached = self._cached_frame(symbol, period, interval)
+            if cached is not None:
+                return cached
+            if batch_limiter is not None:
+                batch_limiter.acquire()
+            return self._fetch_raw(symbol, period, interval)
+
+        def _record_failure(symbol: str, error: Exception) -> None:
+            failed_symbols.append(symbol)
+            self.logger.warning(
+                f"Falha na coleta do símbolo {symbol}",
+                extra={
+                    "symbol": symbol,
+                    "error": str(error),
+                    "position": f"{len(results) + len(failed_symbols)}/{len(symbols)}"
+                }
+            )
 
+        # 1) Requisições (I/O) em threads; acertos no cache já voltam como DataFrame
+        raw_series: Dict[str, Union[Dict, bytes, pd.DataFrame]] = {}
+        if symbols:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as executor:
+                futures = {executor.submit(_fetch, symbol): symbol for symbol in symbols}
+
+                for future in as_completed(futures):
+                    symbol = futures[future]
+                    try:
+                        raw_series[symbol] = future.result()
+                    except Exception as e:
+                        _record_failure(symbol, e)
+
+        frames = {symbol: raw for symbol, raw in raw_series.items() if isinstance(raw, pd.DataFrame)}
+        to_parse = {symbol: raw for symbol, raw in raw_series.items() if symbol not in frames}
+
+        # 2) Conversão (CPU) das séries que não vieram do cache
+        for symbol, parsed in self._parse_many(to_parse).items():
+            if not isinstance(parsed, Exception):
+                self.cache.set(self._frame_cache_key(symbol, period, interval), parsed)
+            frames[symbol] = parsed
+
+        for symbol, parsed in frames.items():
+            if isinstance(parsed, Exception):
+                _record_failure(symbol, parsed)
+                continue
+
+            # 3) Validação no processo principal (usa o validador da instância)
+            try:
+                results[symbol] = self._finalize(parsed, symbol, period, interval, True, start_time)
             except Exception as e:
-                failed_symbols.append(symbol)
-                self.logger.warning(
-                    f"Falha na coleta do símbolo {symbol}",
-                    extra={
-                        "symbol": symbol,
-                        "error": str(e),
-                        "position": f"{i}/{len(symbols)}"
-                    }
-                )
+                _record_failure(symbol, e)
 
         self.logger.info(
             f"Coleta em lote concluída",
@@ -498,12 +868,42 @@ class ChartDataCollector:
                 "successful": len(results),
                 "failed": len(failed_symbols),
                 "failed_symbols": failed_symbols,
-                "success_rate": round(len(results) / len(symbols) * 100, 1)
+                "success_rate": round(len(results) / len(symbols) * 100, 1) if symbols else 0.0
             }
         )
 
-        return results
+        # Mesma ordem da lista de entrada (as_completed entrega fora de ordem)
+        return {symbol: results[symbol] for symbol in symbols if symbol in results}
+
+
+    def _parse_many(self, raw_series: Dict[str, Union[Dict, bytes]]) -> Dict[str, Union[pd.DataFrame, Exception]]:
+        """
+        Converte várias séries brutas em DataFrames no processo atual.
+
+        A conversão leva milissegundos por série: um pool de processos custaria
+        mais (spawn + pickle do JSON) do que economiza, e o spawn reimporta o
+        __main__ do chamador em cada filho.
+
+        Returns:
+            Dict {symbol: DataFrame ou exceção da conversão}
+        """
+        parsed: Dict[str, Union[pd.DataFrame, Exception]] = {}
+        for symbol, series in raw_series.items():
+            try:
+                parsed[symbol] = _parse_raw(series, symbol, self.price_dtype)
+            except Exception as e:
+                parsed[symbol] = e
+        return parsed
+
+# Instância global padrão (criada sob demanda no primeiro uso)
+@functools.lru_cache(maxsize=None)
+def get_default_chart_collector() -> ChartDataCollector:
+    """Retorna o coletor de chart global, criando-o na primeira chamada"""
+    return ChartDataCollector()
 
 
-# Instância global padrão
-default_chart_collector = ChartDataCollector()
+def __getattr__(name: str):
+    """Mantém `default_chart_collector` disponível sem instanciar no import (PEP 562)"""
+    if name == 'default_chart_collector':
+        return get_default_chart_collector()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
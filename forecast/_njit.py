@@ -0,0 +1,22 @@
+"""
+Numba (opcional)
+================
+
+Reexporta `njit` e `prange` do Numba quando instalado. Sem Numba, `njit`
+vira um decorador no-op, `prange` vira `range` e HAS_NUMBA = False, para
+que os indicadores usem o caminho vetorizado em NumPy em vez de laços
+Python interpretados.
+"""
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:  # numba é opcional
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Decorador no-op: devolve a função sem compilar"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
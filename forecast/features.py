@@ -13,6 +13,154 @@ import pandas as pd
 import numpy as np
 from typing import Optional, List
 
+from ._njit import njit, HAS_NUMBA
+
+
+# ===== KERNELS NUMÉRICOS (compilados com Numba quando disponível) =====
+# Assinaturas explícitas: compilação eager no import (com cache em disco), sem
+# aquecimento de JIT na primeira chamada de add_all_features
+
+@njit('float64[:, :](float64[:], float64[:])', cache=True)
+def _ema_multi(close: np.ndarray, alphas: np.ndarray) -> np.ndarray:
+    """EMAs (adjust=False) de vários períodos em uma única leitura de `close`"""
+    n = len(close)
+    k = len(alphas)
+    out = np.empty((k, n))
+    if n == 0:
+        return out
+    for j in range(k):
+        out[j, 0] = close[0]
+    for i in range(1, n):
+        for j in range(k):
+            out[j, i] = out[j, i - 1] + alphas[j] * (close[i] - out[j, i - 1])
+    return out
+
+
+@njit('UniTuple(float64[:], 3)(float64[:], float64, float64, float64)', cache=True)
+def _macd_kernel(close: np.ndarray, a_fast: float, a_slow: float, a_sig: float):
+    """MACD, sinal e histograma com as três EMAs atualizadas na mesma passada"""
+    n = len(close)
+    macd = np.empty(n)
+    sig = np.empty(n)
+    if n == 0:
+        return macd, sig, macd - sig
+    ef = close[0]
+    es = close[0]
+    esig = ef - es
+    for i in range(n):
+        ef += a_fast * (close[i] - ef)
+        es += a_slow * (close[i] - es)
+        m = ef - es
+        macd[i] = m
+        esig += a_sig * (m - esig)
+        sig[i] = esig
+    return macd, sig, macd - sig
+
+
+@njit('float64[:](float64[:], int64)', cache=True)
+def _rsi_kernel(close: np.ndarray, period: int) -> np.ndarray:
+    """RSI com somas deslizantes de ganhos e perdas (a primeira barra conta como variação zero)"""
+    n = len(close)
+    out = np.full(n, np.nan)
+    gain = 0.0
+    loss = 0.0
+    for i in range(1, n):
+        d = close[i] - close[i - 1]
+        if d > 0:
+            gain += d
+        elif d < 0:
+            loss -= d
+        j = i - period
+        if j >= 1:
+            dp = close[j] - close[j - 1]
+            if dp > 0:
+                gain -= dp
+            elif dp < 0:
+                loss += dp
+        if i >= period - 1:
+            if loss > 0:
+                out[i] = 100.0 - 100.0 / (1.0 + gain / loss)
+            elif gain > 0:
+                out[i] = 100.0
+    return out
+
+
+@njit('UniTuple(float64[:], 3)(float64[:], int64, float64)', cache=True)
+def _bollinger_kernel(close: np.ndarray, period: int, k: float):
+    """Bandas de Bollinger com Welford deslizante (média e M2): O(1) por passo"""
+    n = len(close)
+    mid = np.full(n, np.nan)
+    up = np.full(n, np.nan)
+    lo = np.full(n, np.nan)
+    if period < 2:
+        return mid, up, lo
+    # Média e M2 (soma dos desvios² em torno da média) atualizados por
+    # entrada/saída de cada ponto: sem o cancelamento de Σx² - (Σx)²/n em
+    # séries de preço alto (índices, cripto)
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        x = close[i]
+        if i < period:
+            # Preenchimento da primeira janela: Welford padrão
+            delta = x - mean
+            mean += delta / (i + 1)
+            m2 += delta * (x - mean)
+        elif i % period == 0:
+            # Ressincroniza a cada `period` passos com duas passadas exatas sobre
+            # a janela (O(1) amortizado): o erro de arredondamento não se acumula
+            mean = 0.0
+            for j in range(i - period + 1, i + 1):
+                mean += close[j]
+            mean /= period
+            m2 = 0.0
+            for j in range(i - period + 1, i + 1):
+                m2 += (close[j] - mean) * (close[j] - mean)
+        else:
+            # Janela cheia: x entra, close[i - period] sai
+            x_old = close[i - period]
+            old_mean = mean
+            mean += (x - x_old) / period
+            m2 += (x - x_old) * (x - mean + x_old - old_mean)
+        if i >= period - 1:
+            # Variância amostral (ddof=1), como rolling().std()
+            sd = np.sqrt(max(m2 / (period - 1), 0.0))
+            mid[i] = mean
+            up[i] = mean + k * sd
+            lo[i] = mean - k * sd
+    return mid, up, lo
+
+
+@njit(['int64[:](float64[:], int64[:])', 'float64[:](float64[:], float64[:])'], cache=True)
+def _obv_loop(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """Acumula o OBV em uma única passada (NaN conta como sem variação)"""
+    out = np.empty_like(volume)
+    if len(out) == 0:
+        return out
+    out[0] = 0
+    for i in range(1, len(close)):
+        # Direção sem desvio condicional: (alta) - (baixa) em {-1, 0, 1}
+        direction = int(close[i] > close[i - 1]) - int(close[i] < close[i - 1])
+        out[i] = out[i - 1] + direction * volume[i]
+    return out
+
+
+@njit('float64[:](float64[:], float64[:], float64[:])', cache=True)
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range com as três diferenças fundidas em uma passada"""
+    n = len(close)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    # Primeira barra sem fechamento anterior: só high - low (como o max do pandas, que ignora NaN)
+    out[0] = high[0] - low[0]
+    for i in range(1, n):
+        hl = high[i] - low[i]
+        hc = abs(high[i] - close[i - 1])
+        lc = abs(low[i] - close[i - 1])
+        out[i] = max(hl, max(hc, lc))
+    return out
+
 
 class FeatureEngineering:
     """Classe para criar features de análise técnica"""
@@ -27,6 +175,10 @@ class FeatureEngineering:
         self.df = df.copy()
         self._validate_columns()
 
+        # Arrays NumPy das colunas de entrada e derivados, lidos/calculados uma vez
+        # e compartilhados entre os indicadores
+        self._np = {}
+
     def _validate_columns(self):
         """Valida se o DataFrame tem as colunas necessárias"""
         required = ['datetime', 'close']
@@ -38,6 +190,48 @@ class FeatureEngineering:
         if self.df.index.name != 'datetime':
             self.df = self.df.set_index('datetime')
 
+    def _col(self, name: str) -> np.ndarray:
+        """Coluna de entrada como array float64 gravável (memoizado)"""
+        array = self._np.get(name)
+        if array is None:
+            # Com Copy-on-Write (pandas 3) to_numpy devolve uma view somente leitura,
+            # que as assinaturas float64[:] dos kernels não aceitam: copia só nesse caso
+            array = np.require(self.df[name].to_numpy(dtype=np.float64), requirements='W')
+            self._np[name] = array
+        return array
+
+    def _prev_close(self) -> np.ndarray:
+        """Fechamento anterior (NaN na primeira barra), memoizado"""
+        prev_close = self._np.get('prev_close')
+        if prev_close is None:
+            close = self._col('close')
+            prev_close = np.empty_like(close)
+            prev_close[:1] = np.nan
+            prev_close[1:] = close[:-1]
+            self._np['prev_close'] = prev_close
+        return prev_close
+
+    def _close_has_nan(self) -> bool:
+        """Se o fechamento tem NaN (decide entre kernels e o caminho pandas), memoizado"""
+        has_nan = self._np.get('close_has_nan')
+        if has_nan is None:
+            has_nan = bool(np.isnan(self._col('close')).any())
+            self._np['close_has_nan'] = has_nan
+        return has_nan
+
+    def _change_pct(self, period: int) -> np.ndarray:
+        """Variação percentual de `period` barras, (c[i] / c[i - p] - 1) * 100, memoizada"""
+        key = f'change_pct_{period}'
+        change = self._np.get(key)
+        if change is None:
+            close = self._col('close')
+            change = np.full(len(close), np.nan)
+            if 0 < period < len(close):
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    change[period:] = (close[period:] / close[:-period] - 1.0) * 100.0
+            self._np[key] = change
+        return change
+
     # ===== MÉDIAS MÓVEIS =====
 
     def add_sma(self, periods: List[int] = [5, 10, 20, 50, 200]) -> 'FeatureEngineering':
@@ -47,8 +241,24 @@ class FeatureEngineering:
         Args:
             periods: Lista de períodos para calcular SMA
         """
+        close = self._col('close')
+
+        # Soma acumulada única compartilhada por todos os períodos:
+        # SMA_w[i] = (cs[i + 1] - cs[i + 1 - w]) / w
+        # (sem NaN: um NaN contaminaria a soma acumulada dali em diante)
+        if self._close_has_nan():
+            cumsum = None
+        else:
+            cumsum = np.concatenate(([0.0], np.cumsum(close)))
+
         for period in periods:
-            self.df[f'sma_{period}'] = self.df['close'].rolling(window=period).mean()
+            if cumsum is None or period < 1:
+                self.df[f'sma_{period}'] = self.df['close'].rolling(window=period).mean()
+                continue
+
+            sma = np.full(len(close), np.nan)
+            sma[period - 1:] = (cumsum[period:] - cumsum[:-period]) / period
+            self.df[f'sma_{period}'] = sma
         return self
 
     def add_ema(self, periods: List[int] = [12, 26]) -> 'FeatureEngineering':
@@ -58,6 +268,15 @@ class FeatureEngineering:
         Args:
             periods: Lista de períodos para calcular EMA
         """
+        close = self._col('close')
+
+        # Kernel só sem NaN: a recorrência simples não replica o tratamento de NaN do ewm
+        if HAS_NUMBA and len(periods) > 1 and not self._close_has_nan():
+            alphas = np.array([2.0 / (period + 1) for period in periods])
+            for period, ema in zip(periods, _ema_multi(close, alphas)):
+                self.df[f'ema_{period}'] = ema
+            return self
+
         for period in periods:
             self.df[f'ema_{period}'] = self.df['close'].ewm(span=period, adjust=False).mean()
         return self
@@ -71,6 +290,11 @@ class FeatureEngineering:
         Args:
             period: Período para cálculo (padrão: 14)
         """
+        # Kernel só sem NaN: a soma deslizante propagaria um NaN para todas as janelas seguintes
+        if HAS_NUMBA and period > 1 and not self._close_has_nan():
+            self.df['rsi'] = _rsi_kernel(self._col('close'), period)
+            return self
+
         delta = self.df['close'].diff()
         gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
         loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
@@ -88,6 +312,18 @@ class FeatureEngineering:
             slow: Período EMA lenta (padrão: 26)
             signal: Período linha de sinal (padrão: 9)
         """
+        close = self._col('close')
+
+        # Kernel só sem NaN: a recorrência simples não replica o tratamento de NaN do ewm
+        if HAS_NUMBA and not self._close_has_nan():
+            macd, macd_signal, macd_hist = _macd_kernel(
+                close, 2.0 / (fast + 1), 2.0 / (slow + 1), 2.0 / (signal + 1)
+            )
+            self.df['macd'] = macd
+            self.df['macd_signal'] = macd_signal
+            self.df['macd_hist'] = macd_hist
+            return self
+
         ema_fast = self.df['close'].ewm(span=fast, adjust=False).mean()
         ema_slow = self.df['close'].ewm(span=slow, adjust=False).mean()
 
@@ -103,8 +339,13 @@ class FeatureEngineering:
         Args:
             period: Período para cálculo (padrão: 12)
         """
-        self.df['roc'] = ((self.df['close'] - self.df['close'].shift(period)) /
-                          self.df['close'].shift(period) * 100)
+        if period < 1:
+            self.df['roc'] = ((self.df['close'] - self.df['close'].shift(period)) /
+                              self.df['close'].shift(period) * 100)
+            return self
+
+        # Mesma base de add_returns: a variação do período é calculada uma vez
+        self.df['roc'] = self._change_pct(period)
         return self
 
     # ===== VOLATILIDADE =====
@@ -117,6 +358,17 @@ class FeatureEngineering:
             period: Período para SMA (padrão: 20)
             std_dev: Número de desvios padrão (padrão: 2)
         """
+        close = self._col('close')
+
+        # Kernel só sem NaN: a soma deslizante propagaria um NaN para todas as janelas seguintes
+        if HAS_NUMBA and period > 1 and not self._close_has_nan():
+            middle, upper, lower = _bollinger_kernel(close, period, float(std_dev))
+            self.df['bb_middle'] = middle
+            self.df['bb_upper'] = upper
+            self.df['bb_lower'] = lower
+            self.df['bb_width'] = (upper - lower) / middle
+            return self
+
         sma = self.df['close'].rolling(window=period).mean()
         std = self.df['close'].rolling(window=period).std()
 
@@ -136,11 +388,20 @@ class FeatureEngineering:
         if not all(col in self.df.columns for col in ['high', 'low']):
             raise ValueError("ATR requer colunas 'high' e 'low'")
 
-        high_low = self.df['high'] - self.df['low']
-        high_close = abs(self.df['high'] - self.df['close'].shift())
-        low_close = abs(self.df['low'] - self.df['close'].shift())
+        high = self._col('high')
+        low = self._col('low')
+
+        if HAS_NUMBA:
+            true_range = pd.Series(_true_range(high, low, self._col('close')), index=self.df.index)
+        else:
+            prev_close = self._prev_close()
+
+            # fmax ignora NaN como o max(axis=1) do pandas: a primeira barra fica só com high - low
+            true_range = pd.Series(
+                np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close)),
+                index=self.df.index
+            )
 
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
         self.df['atr'] = true_range.rolling(window=period).mean()
         return self
 
@@ -151,16 +412,20 @@ class FeatureEngineering:
         if 'volume' not in self.df.columns:
             raise ValueError("OBV requer coluna 'volume'")
 
-        obv = [0]
-        for i in range(1, len(self.df)):
-            if self.df['close'].iloc[i] > self.df['close'].iloc[i-1]:
-                obv.append(obv[-1] + self.df['volume'].iloc[i])
-            elif self.df['close'].iloc[i] < self.df['close'].iloc[i-1]:
-                obv.append(obv[-1] - self.df['volume'].iloc[i])
-            else:
-                obv.append(obv[-1])
+        close = self._col('close')
+        volume = self.df['volume'].to_numpy()
+
+        if HAS_NUMBA:
+            # Tipos fixados pelas assinaturas do kernel: int64 ou float64
+            volume_dtype = np.int64 if np.issubdtype(volume.dtype, np.integer) else np.float64
+            self.df['obv'] = _obv_loop(close, np.require(volume, dtype=volume_dtype, requirements='W'))
+            return self
+
+        # Direção de cada variação (-1, 0, 1); NaN conta como sem variação
+        change = np.diff(close, prepend=close[:1])
+        direction = (change > 0).astype(np.int8) - (change < 0)
 
-        self.df['obv'] = obv
+        self.df['obv'] = np.cumsum(direction * volume)
         return self
 
     def add_vwap(self) -> 'FeatureEngineering':
@@ -183,12 +448,20 @@ class FeatureEngineering:
             periods: Lista de períodos para calcular retornos
         """
         for period in periods:
-            self.df[f'return_{period}d'] = self.df['close'].pct_change(periods=period) * 100
+            # pct_change preenche NaN com o último valor antes de dividir: com NaN, fica o pandas
+            if period < 1 or self._close_has_nan():
+                self.df[f'return_{period}d'] = self.df['close'].pct_change(periods=period) * 100
+            else:
+                self.df[f'return_{period}d'] = self._change_pct(period)
         return self
 
     def add_log_returns(self) -> 'FeatureEngineering':
         """Adiciona log returns"""
-        self.df['log_return'] = np.log(self.df['close'] / self.df['close'].shift(1))
+        close = self._col('close')
+        log_return = np.full(len(close), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_return[1:] = np.log(close[1:] / close[:-1])
+        self.df['log_return'] = log_return
         return self
 
     # ===== TREND =====
@@ -204,14 +477,13 @@ class FeatureEngineering:
         if not all(col in self.df.columns for col in ['high', 'low']):
             raise ValueError("Trend strength requer 'high' e 'low'")
 
-        plus_dm = self.df['high'].diff()
-        minus_dm = -self.df['low'].diff()
-
-        plus_dm[plus_dm < 0] = 0
-        minus_dm[minus_dm < 0] = 0
+        # Movimentos direcionais com piso em zero via np.maximum (sem máscara booleana);
+        # NaN da primeira barra é preservado
+        plus_dm = np.maximum(np.diff(self._col('high'), prepend=np.nan), 0.0)
+        minus_dm = np.maximum(-np.diff(self._col('low'), prepend=np.nan), 0.0)
 
-        self.df['trend_strength'] = (plus_dm.rolling(window=period).mean() -
-                                     minus_dm.rolling(window=period).mean())
+        # Média móvel é linear: uma única janela sobre a diferença
+        self.df['trend_strength'] = pd.Series(plus_dm - minus_dm, index=self.df.index).rolling(window=period).mean()
         return self
 
     # ===== PIPELINE COMPLETO =====
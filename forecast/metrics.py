@@ -14,6 +14,54 @@ import numpy as np
 import pandas as pd
 from typing import Dict, Optional
 
+from ._njit import njit, prange, HAS_NUMBA
+
+
+def _float_dtype(*arrays) -> type:
+    """float32 se todas as entradas já forem float32 (sem upcast), senão float64"""
+    return np.float32 if all(np.asarray(a).dtype == np.float32 for a in arrays) else np.float64
+
+
+@njit(['UniTuple(float64, 8)(float64[:], float64[:], float64)',
+       'UniTuple(float64, 8)(float32[:], float32[:], float64)'], parallel=True, cache=True)
+def _metrics_kernel(y_true, y_pred, mean_true):
+    """
+    Somas de todas as métricas em uma única passada sobre y_true/y_pred
+    (leituras em float32 ou float64, acumuladores sempre em float64).
+
+    Returns:
+        (soma dos erros², soma dos erros absolutos, soma dos erros percentuais,
+        n com y_true != 0, soma dos desvios² de y_true, soma SMAPE,
+        n com denominador SMAPE != 0, acertos de direção)
+    """
+    sse = 0.0
+    abs_sum = 0.0
+    ape_sum = 0.0
+    ape_count = 0.0
+    ss_tot = 0.0
+    smape_sum = 0.0
+    smape_count = 0.0
+    direction_hits = 0.0
+    for i in prange(len(y_true)):
+        true_value = y_true[i]
+        pred_value = y_pred[i]
+        diff = true_value - pred_value
+        abs_diff = abs(diff)
+        sse += diff * diff
+        abs_sum += abs_diff
+        if true_value != 0.0:
+            ape_sum += abs(diff / true_value)
+            ape_count += 1.0
+        deviation = true_value - mean_true
+        ss_tot += deviation * deviation
+        denominator = abs(true_value) + abs(pred_value)
+        if denominator != 0.0:
+            smape_sum += 2.0 * abs_diff / denominator
+            smape_count += 1.0
+        if i > 0 and (true_value - y_true[i - 1] > 0.0) == (pred_value - y_pred[i - 1] > 0.0):
+            direction_hits += 1.0
+    return sse, abs_sum, ape_sum, ape_count, ss_tot, smape_sum, smape_count, direction_hits
+
 
 class ForecastMetrics:
     """Classe para calcular métricas de forecast"""
@@ -30,7 +78,7 @@ class ForecastMetrics:
         Returns:
             RMSE score
         """
-        return np.sqrt(np.mean((y_true - y_pred) ** 2))
+        return ForecastMetrics._rmse_from_diff(np.subtract(y_true, y_pred))
 
     @staticmethod
     def mae(y_true: np.ndarray, y_pred: np.ndarray) -> float:
@@ -44,7 +92,7 @@ class ForecastMetrics:
         Returns:
             MAE score
         """
-        return np.mean(np.abs(y_true - y_pred))
+        return np.mean(np.abs(np.subtract(y_true, y_pred)))
 
     @staticmethod
     def mape(y_true: np.ndarray, y_pred: np.ndarray) -> float:
@@ -58,9 +106,8 @@ class ForecastMetrics:
         Returns:
             MAPE score (%)
         """
-        # Evitar divisão por zero
-        mask = y_true != 0
-        return np.mean(np.abs((y_true[mask] - y_pred[mask]) / y_true[mask])) * 100
+        abs_diff = np.abs(np.subtract(y_true, y_pred))
+        return ForecastMetrics._mape_from_abs_diff(abs_diff, np.abs(y_true))
 
     @staticmethod
     def r2_score(y_true: np.ndarray, y_pred: np.ndarray) -> float:
@@ -74,9 +121,7 @@ class ForecastMetrics:
         Returns:
             R² score (0 a 1, quanto maior melhor)
         """
-        ss_res = np.sum((y_true - y_pred) ** 2)
-        ss_tot = np.sum((y_true - np.mean(y_true)) ** 2)
-        return 1 - (ss_res / ss_tot)
+        return ForecastMetrics._r2_from_diff(np.subtract(y_true, y_pred), y_true)
 
     @staticmethod
     def directional_accuracy(y_true: np.ndarray, y_pred: np.ndarray) -> float:
@@ -94,7 +139,10 @@ class ForecastMetrics:
         true_direction = np.diff(y_true) > 0
         pred_direction = np.diff(y_pred) > 0
 
-        return np.mean(true_direction == pred_direction) * 100
+        # Divergências via XOR no próprio buffer + count_nonzero (popcount vetorizado)
+        np.bitwise_xor(true_direction, pred_direction, out=true_direction)
+        total = true_direction.size
+        return np.float64(total - np.count_nonzero(true_direction)) / total * 100
 
     @staticmethod
     def smape(y_true: np.ndarray, y_pred: np.ndarray) -> float:
@@ -108,11 +156,45 @@ class ForecastMetrics:
         Returns:
             SMAPE score (%)
         """
-        denominator = (np.abs(y_true) + np.abs(y_pred))
-        mask = denominator != 0
+        abs_diff = np.abs(np.subtract(y_true, y_pred))
+        return ForecastMetrics._smape_from_abs_diff(abs_diff, np.abs(y_true), np.abs(y_pred))
+
+    # Reduções a partir do resíduo já calculado (compartilhado por calculate_all)
+
+    @staticmethod
+    def _rmse_from_diff(diff: np.ndarray) -> float:
+        """RMSE a partir de y_true - y_pred"""
+        # Σd² como produto escalar (BLAS): sem o temporário do ** 2
+        diff = np.ravel(diff)
+        return np.sqrt(np.dot(diff, diff) / diff.size)
+
+    @staticmethod
+    def _r2_from_diff(diff: np.ndarray, y_true: np.ndarray) -> float:
+        """R² a partir de y_true - y_pred"""
+        diff = np.ravel(diff)
+        deviation = np.ravel(np.subtract(y_true, np.mean(y_true)))
+        ss_res = np.dot(diff, diff)
+        ss_tot = np.dot(deviation, deviation)
+        return 1 - (ss_res / ss_tot)
 
-        diff = np.abs(y_true[mask] - y_pred[mask])
-        return np.mean(2.0 * diff / denominator[mask]) * 100
+    @staticmethod
+    def _mape_from_abs_diff(abs_diff: np.ndarray, abs_y_true: np.ndarray) -> float:
+        """MAPE a partir de |y_true - y_pred| e |y_true|"""
+        # Evitar divisão por zero: divide só onde y_true != 0, sem as cópias
+        # compactadas de y_true[mask] (fora da máscara o buffer fica em 0)
+        mask = abs_y_true != 0
+        ratios = np.zeros(np.shape(abs_diff), dtype=_float_dtype(abs_diff, abs_y_true))
+        np.divide(abs_diff, abs_y_true, out=ratios, where=mask)
+        return ratios.sum() / np.count_nonzero(mask) * 100
+
+    @staticmethod
+    def _smape_from_abs_diff(abs_diff: np.ndarray, abs_y_true: np.ndarray, abs_y_pred: np.ndarray) -> float:
+        """SMAPE a partir de |y_true - y_pred|, |y_true| e |y_pred|"""
+        denominator = np.add(abs_y_true, abs_y_pred, dtype=_float_dtype(abs_y_true, abs_y_pred))
+        mask = denominator != 0
+        # Divisão no próprio buffer: onde o denominador é 0 o valor já é 0
+        np.divide(abs_diff, denominator, out=denominator, where=mask)
+        return 2.0 * denominator.sum() / np.count_nonzero(mask) * 100
 
     @staticmethod
     def calculate_all(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, float]:
@@ -126,16 +208,104 @@ class ForecastMetrics:
         Returns:
             Dicionário com todas as métricas
         """
+        if HAS_NUMBA:
+            # float32 de ponta a ponta quando as entradas já são float32; as assinaturas
+            # do kernel só aceitam arrays graváveis (Series.values é somente leitura
+            # com Copy-on-Write), então copia só nesse caso
+            dtype = _float_dtype(y_true, y_pred)
+            y_true_arr = np.require(y_true, dtype=dtype, requirements=['C', 'W'])
+            y_pred_arr = np.require(y_pred, dtype=dtype, requirements=['C', 'W'])
+            if y_true_arr.ndim == 1 and y_true_arr.shape == y_pred_arr.shape:
+                return ForecastMetrics._calculate_all_fused(y_true_arr, y_pred_arr)
+
+        # Resíduo calculado uma vez e reaproveitado por todas as métricas
+        y_true = np.asarray(y_true)
+        y_pred = np.asarray(y_pred)
+        diff = y_true - y_pred
+        abs_diff = np.abs(diff)
+        abs_y_true = np.abs(y_true)
+
         metrics = {
-            'rmse': ForecastMetrics.rmse(y_true, y_pred),
-            'mae': ForecastMetrics.mae(y_true, y_pred),
-            'mape': ForecastMetrics.mape(y_true, y_pred),
-            'r2': ForecastMetrics.r2_score(y_true, y_pred),
+            'rmse': ForecastMetrics._rmse_from_diff(diff),
+            'mae': np.mean(abs_diff),
+            'mape': ForecastMetrics._mape_from_abs_diff(abs_diff, abs_y_true),
+            'r2': ForecastMetrics._r2_from_diff(diff, y_true),
             'directional_accuracy': ForecastMetrics.directional_accuracy(y_true, y_pred),
-            'smape': ForecastMetrics.smape(y_true, y_pred),
+            'smape': ForecastMetrics._smape_from_abs_diff(abs_diff, abs_y_true, np.abs(y_pred)),
         }
         return metrics
 
+    @staticmethod
+    def calculate_all_batch(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Calcula todas as métricas para várias séries de uma vez (ex: backtests
+        de vários símbolos), com reduções vetorizadas ao longo do eixo temporal
+
+        Args:
+            y_true: Valores reais, shape (n_series, T)
+            y_pred: Valores preditos, shape (n_series, T)
+
+        Returns:
+            Dicionário {métrica: array (n_series,)}, mesmas chaves de calculate_all
+        """
+        dtype = _float_dtype(y_true, y_pred)
+        y_true = np.atleast_2d(np.asarray(y_true, dtype=dtype))
+        y_pred = np.atleast_2d(np.asarray(y_pred, dtype=dtype))
+        if y_true.ndim != 2 or y_true.shape != y_pred.shape:
+            raise ValueError(
+                f"y_true e y_pred devem ter o mesmo shape (n_series, T): {y_true.shape} vs {y_pred.shape}"
+            )
+
+        n_steps = y_true.shape[1]
+        diff = y_true - y_pred
+        abs_diff = np.abs(diff)
+        abs_y_true = np.abs(y_true)
+
+        # Somas de quadrados por linha sem temporário do ** 2
+        sse = np.einsum('ij,ij->i', diff, diff)
+        deviation = y_true - y_true.mean(axis=1, keepdims=True)
+        ss_tot = np.einsum('ij,ij->i', deviation, deviation)
+
+        # MAPE: divide só onde y_true != 0 (fora da máscara fica 0)
+        mape_mask = abs_y_true != 0
+        ratios = np.zeros_like(y_true)
+        np.divide(abs_diff, abs_y_true, out=ratios, where=mape_mask)
+
+        # SMAPE: divisão no próprio buffer do denominador
+        denominator = abs_y_true + np.abs(y_pred)
+        smape_mask = denominator != 0
+        np.divide(abs_diff, denominator, out=denominator, where=smape_mask)
+
+        mismatches = (np.diff(y_true, axis=1) > 0) ^ (np.diff(y_pred, axis=1) > 0)
+
+        return {
+            'rmse': np.sqrt(sse / n_steps),
+            'mae': abs_diff.mean(axis=1),
+            'mape': ratios.sum(axis=1) / mape_mask.sum(axis=1) * 100,
+            'r2': 1 - (sse / ss_tot),
+            'directional_accuracy': (n_steps - 1 - np.count_nonzero(mismatches, axis=1)) / (n_steps - 1) * 100,
+            'smape': 2.0 * denominator.sum(axis=1) / smape_mask.sum(axis=1) * 100,
+        }
+
+    @staticmethod
+    def _calculate_all_fused(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, float]:
+        """calculate_all via kernel Numba: uma passada em vez de seis, sem temporários"""
+        # Média em passada separada: Σ(y - média)² é estável, ao contrário de Σy² - (Σy)²/n
+        mean_true = y_true.mean(dtype=np.float64) if len(y_true) else np.nan
+        # Somas como np.float64: divisões por zero viram nan/inf, como nas versões NumPy
+        (sse, abs_sum, ape_sum, ape_count, ss_tot,
+         smape_sum, smape_count, direction_hits) = np.array(_metrics_kernel(y_true, y_pred, mean_true))
+        n = np.float64(len(y_true))
+
+        return {
+            'rmse': np.sqrt(sse / n),
+            'mae': abs_sum / n,
+            'mape': ape_sum / ape_count * 100,
+            'r2': 1 - (sse / ss_tot),
+            'directional_accuracy': direction_hits / max(n - 1, 0) * 100,
+            'smape': smape_sum / smape_count * 100,
+        }
+
     @staticmethod
     def print_metrics(metrics: Dict[str, float], title: str = "Métricas de Forecast"):
         """
@@ -164,8 +334,6 @@ class ForecastMetrics:
         Args:
             results: Dict {model_name: {metric: value}}
         """
-        import pandas as pd
-
         df = pd.DataFrame(results).T
 
         print(f"\n{'='*80}")
@@ -174,12 +342,16 @@ class ForecastMetrics:
         print(df.to_string())
         print(f"\n🏆 Melhores modelos por métrica:")
 
-        # RMSE e MAE: menor é melhor
-        print(f"   RMSE:  {df['rmse'].idxmin()} ({df['rmse'].min():.4f})")
-        print(f"   MAE:   {df['mae'].idxmin()} ({df['mae'].min():.4f})")
-        print(f"   MAPE:  {df['mape'].idxmin()} ({df['mape'].min():.2f}%)")
-
-        # R² e Accuracy: maior é melhor
-        print(f"   R²:    {df['r2'].idxmax()} ({df['r2'].max():.4f})")
-        print(f"   Dir. Accuracy: {df['directional_accuracy'].idxmax()} ({df['directional_accuracy'].max():.2f}%)")
-        print(f"{'='*80}\n")
+        # Vencedores e valores de todas as métricas em uma única agregação
+        best = df[['rmse', 'mae', 'mape', 'r2', 'directional_accuracy']].agg(['idxmin', 'min', 'idxmax', 'max'])
+
+        print("\n".join([
+            # RMSE e MAE: menor é melhor
+            f"   RMSE:  {best.at['idxmin', 'rmse']} ({best.at['min', 'rmse']:.4f})",
+            f"   MAE:   {best.at['idxmin', 'mae']} ({best.at['min', 'mae']:.4f})",
+            f"   MAPE:  {best.at['idxmin', 'mape']} ({best.at['min', 'mape']:.2f}%)",
+            # R² e Accuracy: maior é melhor
+            f"   R²:    {best.at['idxmax', 'r2']} ({best.at['max', 'r2']:.4f})",
+            f"   Dir. Accuracy: {best.at['idxmax', 'directional_accuracy']} ({best.at['max', 'directional_accuracy']:.2f}%)",
+            f"{'='*80}\n",
+        ]))
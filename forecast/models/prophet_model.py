@@ -65,6 +65,8 @@ class ProphetModel:
         self.model = None
         self.forecast = None
         self.training_data = None
+        # Média dos deltas dos changepoints (calculada após o fit)
+        self._delta_mean = None
 
         # Configurações do modelo
         self.config = {
@@ -140,6 +142,9 @@ class ProphetModel:
             warnings.simplefilter("ignore")
             self.model.fit(self.training_data)
 
+        # 'delta' pode ter milhares de amostras (MCMC): reduz uma única vez
+        self._delta_mean = np.asarray(self.model.params['delta']).mean(axis=0)
+
         print(f"✅ Modelo treinado com {len(self.training_data)} pontos de dados")
         print(f"   Período: {self.training_data['ds'].min()} → {self.training_data['ds'].max()}")
 
@@ -294,16 +299,18 @@ class ProphetModel:
         if self.model is None:
             raise ValueError("Modelo não foi treinado.")
 
-        changepoints = pd.DataFrame({
-            'datetime': self.model.changepoints,
-            'delta': self.model.params['delta'].mean(axis=0)
-        })
+        # Modelos vindos de load_model ainda não têm a média em cache
+        if self._delta_mean is None:
+            self._delta_mean = np.asarray(self.model.params['delta']).mean(axis=0)
+        delta = self._delta_mean
 
-        # Ordenar por magnitude do delta
-        changepoints['abs_delta'] = changepoints['delta'].abs()
-        changepoints = changepoints.sort_values('abs_delta', ascending=False)
+        # Ordenar por magnitude do delta (decrescente)
+        order = np.argsort(-np.abs(delta), kind='stable')
 
-        return changepoints[['datetime', 'delta']].reset_index(drop=True)
+        return pd.DataFrame({
+            'datetime': np.asarray(self.model.changepoints)[order],
+            'delta': delta[order]
+        })
 
     def summary(self) -> Dict:
         """
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+import forecast.features as features
+from forecast.features import FeatureEngineering
+
+
+def _sample_prices(n: int = 300) -> pd.DataFrame:
+    """Série OHLCV sintética com nível alto (testa estabilidade numérica)"""
+    rng = np.random.default_rng(42)
+    close = 60000 + rng.standard_normal(n).cumsum() * 50
+    return pd.DataFrame({
+        'datetime': pd.date_range('2025-01-01', periods=n, freq='D'),
+        'open': close + rng.standard_normal(n),
+        'high': close + np.abs(rng.standard_normal(n)) * 20,
+        'low': close - np.abs(rng.standard_normal(n)) * 20,
+        'close': close,
+        'volume': rng.integers(1_000, 100_000, n),
+    })
+
+
+def test_add_all_features_matches_pandas_reference(monkeypatch):
+    """Kernels (Numba quando instalado) devem bater com o caminho pandas/NumPy"""
+    print("=== Teste add_all_features vs referência pandas ===")
+    df = _sample_prices()
+    has_numba = features.HAS_NUMBA
+
+    result = FeatureEngineering(df).add_all_features().get_dataframe()
+
+    monkeypatch.setattr(features, 'HAS_NUMBA', False)
+    reference = FeatureEngineering(df).add_all_features().get_dataframe()
+
+    print(f"   Numba: {'sim' if has_numba else 'não'} | colunas: {len(result.columns)}")
+    assert list(result.columns) == list(reference.columns)
+    pdt.assert_frame_equal(result, reference, check_dtype=False, rtol=1e-7)
+    print("   ✅ Features idênticas à referência")
+
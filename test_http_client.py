@@ -21,7 +21,7 @@ def test_client_initialization():
     print("✅ Cliente personalizado inicializado")
 
     # Verificar headers stealth
-    headers = client.session.headers
+    headers = client.headers
     print(f"   User-Agent: {headers.get('User-Agent', 'N/A')[:50]}...")
     print(f"   Headers stealth: {len(headers)} headers configurados")
 
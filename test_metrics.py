@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import forecast.metrics as metrics
+from forecast.metrics import ForecastMetrics
+
+
+def _sample_series(n: int = 500):
+    """Valores reais/preditos sintéticos, com zeros em y_true (testa MAPE/SMAPE)"""
+    rng = np.random.default_rng(7)
+    y_true = 100 + rng.standard_normal(n).cumsum()
+    y_true[::50] = 0.0
+    y_pred = y_true + rng.standard_normal(n)
+    return y_true, y_pred
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+def test_calculate_all_fused_matches_numpy_path(monkeypatch, dtype):
+    """Kernel fundido (Numba quando instalado) deve bater com o caminho NumPy"""
+    print(f"=== Teste calculate_all fundido vs NumPy ({np.dtype(dtype).name}) ===")
+    y_true, y_pred = _sample_series()
+    # Series como em ProphetModel.evaluate (somente leitura com Copy-on-Write)
+    y_true = pd.Series(y_true.astype(dtype))
+    y_pred = pd.Series(y_pred.astype(dtype))
+
+    fused = ForecastMetrics.calculate_all(y_true, y_pred)
+
+    monkeypatch.setattr(metrics, 'HAS_NUMBA', False)
+    reference = ForecastMetrics.calculate_all(y_true.to_numpy(), y_pred.to_numpy())
+
+    rtol = 1e-4 if dtype == np.float32 else 1e-9
+    assert fused.keys() == reference.keys()
+    for name, value in reference.items():
+        print(f"   {name}: {fused[name]:.6f} vs {value:.6f}")
+        assert fused[name] == pytest.approx(value, rel=rtol)
+    print("   ✅ Métricas idênticas à referência")
@@ -8,7 +8,8 @@ def test_rate_limiter_basic():
     print("=== Teste Rate Limiter Básico ===")
 
     # Rate limiter bem agressivo para testar rapidamente (4 req/min = 15s intervalo)
-    limiter = RateLimiter(requests_per_minute=4)
+    # capacity=1 desativa rajadas para medir o intervalo entre requisições
+    limiter = RateLimiter(requests_per_minute=4, capacity=1)
 
     print("1. Primeira requisição (deve ser imediata)")
     start_time = time.time()
@@ -390,10 +390,10 @@ class DataAnalyzer:
         
         # Dias com volume anômalo (> 2 desvios padrão)
         df['volume_zscore'] = (df['volume'] - mean_vol) / std_vol
-        anomalous_volume_days = df[abs(df['volume_zscore']) > 2]
+        anomalous_volume_days = int((df['volume_zscore'].abs() > 2).sum())
         
         # Dias com volume zero
-        zero_volume_days = df[df['volume'] == 0]
+        zero_volume_days = int((df['volume'] == 0).sum())
         
         return {
             "average_volume": int(mean_vol),
@@ -401,8 +401,8 @@ class DataAnalyzer:
             "median_volume": int(df['volume'].median()),
             "max_volume": int(df['volume'].max()),
             "min_volume": int(df['volume'].min()),
-            "zero_volume_days": len(zero_volume_days),
-            "anomalous_volume_days": len(anomalous_volume_days),
+            "zero_volume_days": zero_volume_days,
+            "anomalous_volume_days": anomalous_volume_days,
             "volume_concentration": {
                 "top_10_days_volume_pct": float((df.nlargest(10, 'volume')['volume'].sum() / df['volume'].sum()) * 100)
             }
@@ -136,11 +136,14 @@ class FinancialDataValidator:
             }
         )
 
-    def validate(self, df: pd.DataFrame, symbol: str) -> ValidationResult:
+    def validate(self, df: pd.DataFrame, symbol: str, quality_checks: bool = True) -> ValidationResult:
         """
         Args:
             df: DataFrame com dados financeiros
             symbol: Símbolo da ação
+            quality_checks: Se False, pula as checagens que só geram issues WARNING/INFO
+                (gaps, fins de semana, variações extremas, outliers); as que podem
+                gerar issues críticas rodam sempre
 
         Returns:
             ValidationResult com todas as issues encontradas
@@ -161,8 +164,8 @@ class FinancialDataValidator:
         # Pipeline sequencial de validação
         issues.extend(self._validate_basic_structure(df, symbol))
         issues.extend(self._validate_financial_consistency(df, symbol))
-        issues.extend(self._validate_temporal_sequence(df, symbol))
-        issues.extend(self._validate_market_anomalies(df, symbol))
+        issues.extend(self._validate_temporal_sequence(df, symbol, quality_checks))
+        issues.extend(self._validate_market_anomalies(df, symbol, quality_checks))
 
         # Auto-correção se habilitada e não há issues críticas
         critical_issues = [i for i in issues if i.severity == Severity.CRITICAL]
@@ -284,7 +287,7 @@ class FinancialDataValidator:
             if col in df.columns:
                 null_count = df[col].isnull().sum()
                 if null_count > 0:
-                    null_rows = df[df[col].isnull()].index.tolist()
+                    null_rows = df.index[df[col].isnull()].tolist()
                     issues.append(Issue(
                         type=IssueType.MISSING_DATA,
                         severity=Severity.CRITICAL,
@@ -346,7 +349,7 @@ class FinancialDataValidator:
         for col in required_price_cols:
             negative_mask = df[col] <= 0
             if negative_mask.any():
-                negative_rows = df[negative_mask].index.tolist()
+                negative_rows = df.index[negative_mask].tolist()
                 issues.append(Issue(
                     type=IssueType.NEGATIVE_PRICE,
                     severity=Severity.CRITICAL,
@@ -360,7 +363,7 @@ class FinancialDataValidator:
             # Volume negativo é impossível
             negative_volume_mask = df['volume'] < 0
             if negative_volume_mask.any():
-                negative_vol_rows = df[negative_volume_mask].index.tolist()
+                negative_vol_rows = df.index[negative_volume_mask].tolist()
                 issues.append(Issue(
                     type=IssueType.ZERO_VOLUME,
                     severity=Severity.CRITICAL,
@@ -373,7 +376,7 @@ class FinancialDataValidator:
             # Volume zero indica falta de liquidez
             zero_volume_mask = df['volume'] == 0
             if zero_volume_mask.any():
-                zero_vol_rows = df[zero_volume_mask].index.tolist()
+                zero_vol_rows = df.index[zero_volume_mask].tolist()
                 issues.append(Issue(
                     type=IssueType.ZERO_VOLUME,
                     severity=Severity.WARNING,
@@ -386,7 +389,7 @@ class FinancialDataValidator:
         # Low deve ser <= Open, High, Close
         low_open_violations = (df['low'] > df['open'] + tolerance)
         if low_open_violations.any():
-            violation_rows = df[low_open_violations].index.tolist()
+            violation_rows = df.index[low_open_violations].tolist()
             issues.append(Issue(
                 type=IssueType.PRICE_INCONSISTENCY,
                 severity=Severity.WARNING,
@@ -398,7 +401,7 @@ class FinancialDataValidator:
 
         low_high_violations = (df['low'] > df['high'] + tolerance)
         if low_high_violations.any():
-            violation_rows = df[low_high_violations].index.tolist()
+            violation_rows = df.index[low_high_violations].tolist()
             issues.append(Issue(
                 type=IssueType.PRICE_INCONSISTENCY,
                 severity=Severity.CRITICAL,  # Este é realmente impossível
@@ -410,7 +413,7 @@ class FinancialDataValidator:
 
         low_close_violations = (df['low'] > df['close'] + tolerance)
         if low_close_violations.any():
-            violation_rows = df[low_close_violations].index.tolist()
+            violation_rows = df.index[low_close_violations].tolist()
             issues.append(Issue(
                 type=IssueType.PRICE_INCONSISTENCY,
                 severity=Severity.WARNING,
@@ -423,7 +426,7 @@ class FinancialDataValidator:
         # High deve ser >= Open, Low, Close
         high_open_violations = (df['high'] + tolerance < df['open'])
         if high_open_violations.any():
-            violation_rows = df[high_open_violations].index.tolist()
+            violation_rows = df.index[high_open_violations].tolist()
             issues.append(Issue(
                 type=IssueType.PRICE_INCONSISTENCY,
                 severity=Severity.WARNING,
@@ -435,7 +438,7 @@ class FinancialDataValidator:
 
         high_close_violations = (df['high'] + tolerance < df['close'])
         if high_close_violations.any():
-            violation_rows = df[high_close_violations].index.tolist()
+            violation_rows = df.index[high_close_violations].tolist()
             issues.append(Issue(
                 type=IssueType.PRICE_INCONSISTENCY,
                 severity=Severity.WARNING,
@@ -452,7 +455,7 @@ class FinancialDataValidator:
             (abs(df['open'] - df['close']) <= tolerance)
         )
         if all_equal_mask.any():
-            equal_rows = df[all_equal_mask].index.tolist()
+            equal_rows = df.index[all_equal_mask].tolist()
             issues.append(Issue(
                 type=IssueType.PRICE_INCONSISTENCY,
                 severity=Severity.WARNING,
@@ -464,13 +467,14 @@ class FinancialDataValidator:
 
         return issues
 
-    def _validate_temporal_sequence(self, df: pd.DataFrame, symbol: str) -> List[Issue]:
+    def _validate_temporal_sequence(self, df: pd.DataFrame, symbol: str, quality_checks: bool = True) -> List[Issue]:
         """
         Validações de sequência temporal e gaps de mercado.
 
         Args:
             df: DataFrame para validar (deve estar ordenado por data)
             symbol: Símbolo da ação
+            quality_checks: Se False, só verifica datas duplicadas (CRITICAL)
 
         Returns:
             Lista de issues encontradas
@@ -490,7 +494,7 @@ class FinancialDataValidator:
         # 1. Verificar duplicatas de data (CRITICAL)
         duplicated_dates = df_dates.duplicated()
         if duplicated_dates.any():
-            dup_rows = df[duplicated_dates].index.tolist()
+            dup_rows = df.index[duplicated_dates].tolist()
             unique_dup_dates = df_dates[duplicated_dates].dt.date.unique()
             issues.append(Issue(
                 type=IssueType.DATE_DUPLICATE,
@@ -501,13 +505,17 @@ class FinancialDataValidator:
                 suggested_fix="Remover registros duplicados mantendo o mais recente"
             ))
 
+        # Demais checagens temporais só geram WARNING/INFO
+        if not quality_checks:
+            return issues
+
         # 2. Verificar ordem cronológica (WARNING - pode ser só questão de sort)
         if not df_dates.is_monotonic_increasing:
             # Encontrar onde a ordem quebra
             diff = df_dates.diff()
             negative_diffs = diff < pd.Timedelta(0)
             if negative_diffs.any():
-                out_of_order_rows = df[negative_diffs].index.tolist()
+                out_of_order_rows = df.index[negative_diffs].tolist()
                 issues.append(Issue(
                     type=IssueType.DATE_ORDER,
                     severity=Severity.WARNING,
@@ -536,7 +544,7 @@ class FinancialDataValidator:
         # Gaps suspeitos (> 7 dias) precisam investigação
         suspicious_gaps = date_diffs > 7
         if suspicious_gaps.any():
-            gap_rows = df[suspicious_gaps].index.tolist()
+            gap_rows = df.index[suspicious_gaps].tolist()
             max_gap = date_diffs.max()
             issues.append(Issue(
                 type=IssueType.DATE_GAP,
@@ -554,7 +562,7 @@ class FinancialDataValidator:
         # 5 = Sábado, 6 = Domingo
         weekend_trading = df_with_weekday['weekday'].isin([5, 6])
         if weekend_trading.any():
-            weekend_rows = df[weekend_trading].index.tolist()
+            weekend_rows = df.index[weekend_trading].tolist()
             issues.append(Issue(
                 type=IssueType.DATE_GAP,
                 severity=Severity.WARNING,
@@ -594,7 +602,7 @@ class FinancialDataValidator:
 
         return issues
 
-    def _validate_market_anomalies(self, df: pd.DataFrame, symbol: str) -> List[Issue]:
+    def _validate_market_anomalies(self, df: pd.DataFrame, symbol: str, quality_checks: bool = True) -> List[Issue]:
         """
         Valida anomalias de mercado:
         - Variações de preço extremas (> 20% em um dia)
@@ -604,6 +612,7 @@ class FinancialDataValidator:
         Args:
             df: DataFrame para validar
             symbol: Símbolo da ação
+            quality_checks: Se False, só verifica volume zero (pode ser CRITICAL)
 
         Returns:
             Lista de issues encontradas
@@ -617,8 +626,8 @@ class FinancialDataValidator:
             return issues  # Precisa de pelo menos 2 registros
 
         # 1. Variações de preço diárias extremas (> 20%)
-        if 'close' in df.columns:
-            df_sorted = df.sort_values('datetime')
+        if quality_checks and 'close' in df.columns:
+            df_sorted = df if df['datetime'].is_monotonic_increasing else df.sort_values('datetime')
             price_changes = df_sorted['close'].pct_change().abs()
 
             extreme_variations = price_changes > self.max_daily_variation
@@ -674,7 +683,10 @@ class FinancialDataValidator:
                     }
                 )
 
-        # 3. Outliers estatísticos usando IQR (Interquartile Range)
+        # 3. Outliers estatísticos usando IQR (Interquartile Range), só INFO
+        if not quality_checks:
+            return issues
+
         numeric_cols = ['open', 'high', 'low', 'close', 'volume']
         for col in numeric_cols:
             if col not in df.columns:
@@ -767,7 +779,10 @@ class FinancialDataValidator:
         # 2. Ordenar cronologicamente
         if 'datetime' in corrected.columns:
             was_sorted = corrected['datetime'].is_monotonic_increasing
-            corrected = corrected.sort_values('datetime').reset_index(drop=True)
+            # Séries dos coletores já chegam ordenadas: sort (e cópia) só se necessário
+            if not was_sorted:
+                corrected = corrected.sort_values('datetime')
+            corrected.reset_index(drop=True, inplace=True)
             if not was_sorted:
                 correction_issues.append(Issue(
                     type=IssueType.OUT_OF_ORDER,